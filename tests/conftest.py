@@ -0,0 +1,12 @@
+"""Shared test configuration."""
+
+import os
+import tempfile
+from pathlib import Path
+
+# Give each pytest-xdist worker its own data directory (and so its own SQLite
+# database). This must run before transcriber.config is imported.
+_worker = os.environ.get("PYTEST_XDIST_WORKER", "main")
+os.environ["TRANSCRIBER_DATA_DIR"] = str(
+    Path(tempfile.gettempdir()) / f"video-transcriber-test-{_worker}"
+)
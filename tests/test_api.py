@@ -1,33 +1,50 @@
 """Integration tests for FastAPI endpoints."""
 
+import asyncio
+
+import orjson
 import pytest
+import pytest_asyncio
 from httpx import AsyncClient, ASGITransport
+from sqlalchemy import delete, event, func, select
+
+from transcriber.main import (
+    _batch_text,
+    app,
+    process_transcription_task,
+    progress_events,
+    progress_store,
+    publish_progress,
+)
+from transcriber.database import engine, get_session, init_db
+from transcriber.models import Transcription, TranscriptionSegment
+from transcriber.services.transcription import TranscriptionService
+from transcriber.services.whisper import WhisperEngine
 
-from transcriber.main import app
-from transcriber.database import init_db
+# Async tests share one event loop with the session-scoped fixtures below
+session_loop = pytest.mark.asyncio(loop_scope="session")
 
 
-@pytest.fixture(autouse=True)
+@pytest_asyncio.fixture(scope="session", loop_scope="session", autouse=True)
 async def setup_db():
-    """Initialize database before each test."""
+    """Initialize database once for the whole test session."""
     await init_db()
 
 
-@pytest.fixture
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
 async def client():
-    """Create async test client."""
+    """Create one async test client for the whole test session."""
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://test") as ac:
         yield ac
 
 
+@session_loop
 class TestTranscriptionsAPI:
-    @pytest.mark.asyncio
     async def test_root_endpoint(self, client):
         response = await client.get("/")
         assert response.status_code == 200
 
-    @pytest.mark.asyncio
     async def test_list_transcriptions_empty(self, client):
         response = await client.get("/api/transcriptions")
         assert response.status_code == 200
@@ -35,22 +52,154 @@ class TestTranscriptionsAPI:
         assert "items" in data
         assert isinstance(data["items"], list)
 
-    @pytest.mark.asyncio
     async def test_create_transcription_no_input(self, client):
         response = await client.post("/api/transcriptions")
         assert response.status_code == 422  # Validation error
 
-    @pytest.mark.asyncio
     async def test_get_transcription_not_found(self, client):
         response = await client.get("/api/transcriptions/nonexistent-id")
         assert response.status_code == 404
 
-    @pytest.mark.asyncio
     async def test_delete_transcription_not_found(self, client):
         response = await client.delete("/api/transcriptions/nonexistent-id")
         assert response.status_code == 404
 
-    @pytest.mark.asyncio
     async def test_download_transcription_not_found(self, client):
         response = await client.get("/api/transcriptions/nonexistent-id/download")
         assert response.status_code == 404
+
+
+    async def test_delete_transcription_is_committed(self, client):
+        service = TranscriptionService()
+        async with get_session() as session:
+            transcription = await service.create_transcription(
+                session, source_type="file", source_name="delete-me.mp4"
+            )
+
+        response = await client.delete(f"/api/transcriptions/{transcription.id}")
+        assert response.status_code == 200
+        async with get_session() as session:
+            assert await service.get_transcription(session, transcription.id) is None
+
+
+@session_loop
+class TestProgress:
+    async def test_finished_event_stream_leaves_no_event(self, client):
+        publish_progress("sse-done", {"progress": 100, "status": "completed"})
+        response = await client.get("/api/transcriptions/sse-done/events")
+        assert '"status":"completed"' in response.text
+        assert "sse-done" not in progress_events
+
+    async def test_failed_job_keeps_error_message(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(WhisperEngine, "load", lambda self: None)
+        source = tmp_path / "broken.mp4"
+        source.write_bytes(b"not a video")
+        async with get_session() as session:
+            transcription = await TranscriptionService().create_transcription(
+                session, source_type="file", source_name=source.name
+            )
+
+        await process_transcription_task(
+            transcription_id=transcription.id,
+            source_type="file",
+            source_path=source,
+            youtube_url=None,
+            model="tiny",
+            language="auto",
+            include_timestamps=False,
+            llm_format=False,
+        )
+        await asyncio.sleep(0)  # run any callbacks queued from worker threads
+
+        data = progress_store[transcription.id]
+        assert data["status"] == "failed"
+        assert data["error"]
+
+
+@session_loop
+class TestSegmentStorage:
+    SEGMENTS = [
+        {"start": 0.0, "end": 1.5, "text": "Hello"},
+        {"start": 1.5, "end": 3.0, "text": "world"},
+    ]
+
+    async def count_segment_rows(self, transcription_id):
+        async with get_session() as session:
+            return await session.scalar(
+                select(func.count())
+                .select_from(TranscriptionSegment)
+                .where(TranscriptionSegment.transcription_id == transcription_id)
+            )
+
+    async def create_with_segments(self, service, segments):
+        async with get_session() as session:
+            transcription = await service.create_transcription(
+                session, source_type="file", source_name="a.mp4"
+            )
+        # Like TranscriptionService._save: segments are set on a loaded record
+        async with get_session() as session:
+            stored = await service.get_transcription(session, transcription.id)
+            stored.segments = segments
+        return transcription.id
+
+    async def test_segments_round_trip(self):
+        service = TranscriptionService()
+        transcription_id = await self.create_with_segments(service, self.SEGMENTS)
+
+        async with get_session() as session:
+            stored = await service.get_transcription(session, transcription_id)
+            assert stored.segments == self.SEGMENTS
+            assert stored.segments_json == "[]"
+        assert await self.count_segment_rows(transcription_id) == 2
+
+    async def test_legacy_segments_json_fallback(self):
+        service = TranscriptionService()
+        async with get_session() as session:
+            transcription = await service.create_transcription(
+                session, source_type="file", source_name="legacy.mp4"
+            )
+            transcription.segments_json = orjson.dumps(self.SEGMENTS).decode()
+
+        async with get_session() as session:
+            stored = await service.get_transcription(session, transcription.id)
+            assert stored.segments == self.SEGMENTS
+
+    async def test_deleting_transcription_cascades_to_segments(self):
+        transcription_id = await self.create_with_segments(TranscriptionService(), self.SEGMENTS)
+        assert await self.count_segment_rows(transcription_id) == 2
+
+        # Bulk delete skips the ORM cascade, so only the foreign key removes the rows
+        async with get_session() as session:
+            await session.execute(
+                delete(Transcription).where(Transcription.id == transcription_id)
+            )
+        assert await self.count_segment_rows(transcription_id) == 0
+
+    async def test_service_delete_leaves_segments_to_the_database(self):
+        service = TranscriptionService()
+        transcription_id = await self.create_with_segments(service, self.SEGMENTS)
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine.sync_engine, "before_cursor_execute", record)
+        try:
+            async with get_session() as session:
+                assert await service.delete_transcription(session, transcription_id)
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+        assert not [s for s in statements if "transcription_segments" in s]
+        assert await self.count_segment_rows(transcription_id) == 0
+
+
+class TestDownloadChunking:
+    def test_batch_text_joins_small_parts(self):
+        parts = ["abc"] * 10
+        chunks = list(_batch_text(parts, size=8))
+        assert chunks == ["abcabcabc", "abcabcabc", "abcabcabc", "abc"]
+        assert "".join(chunks) == "abc" * 10
+
+    def test_batch_text_empty(self):
+        assert list(_batch_text([])) == []
@@ -4,6 +4,7 @@ import pytest
 from typer.testing import CliRunner
 
 from transcriber.cli import app, is_youtube_url
+from transcriber.services.whisper import WhisperEngine
 
 runner = CliRunner()
 
@@ -34,6 +35,17 @@ class TestCLI:
         assert result.exit_code == 1
         assert "not found" in result.stdout.lower() or "error" in result.stdout.lower()
 
+    def test_transcribe_unsupported_file_skips_model_load(self, tmp_path, monkeypatch):
+        loads = []
+        monkeypatch.setattr(WhisperEngine, "load", lambda self: loads.append(self))
+        source = tmp_path / "notes.txt"
+        source.write_text("not a video")
+
+        result = runner.invoke(app, ["transcribe", str(source)])
+        assert result.exit_code == 1
+        assert "unsupported format" in result.stdout.lower()
+        assert loads == []
+
 
 class TestYouTubeUrlDetection:
     def test_youtube_watch_url(self):
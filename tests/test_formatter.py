@@ -76,3 +76,21 @@ class TestOutputFormatter:
 
         result = formatter.to_plain_text([])
         assert result == ""
+
+    def test_iter_srt_matches_to_srt(self, formatter, sample_segments):
+        chunks = list(formatter.iter_srt(sample_segments))
+        assert len(chunks) == len(sample_segments)
+        assert "".join(chunks) == formatter.to_srt(sample_segments)
+
+    def test_iter_markdown_matches_to_markdown(self, formatter, sample_segments):
+        chunks = formatter.iter_markdown(sample_segments, include_timestamps=True, title="T")
+        expected = formatter.to_markdown(sample_segments, include_timestamps=True, title="T")
+        assert "".join(chunks) == expected
+
+    def test_format_time_srt_millisecond_rounding(self, formatter):
+        # 0.29 % 1 * 1000 is 289.99..., integer milliseconds avoid the off-by-one
+        assert formatter.format_time_srt(0.29) == "00:00:00,290"
+
+    def test_format_times_srt_matches_scalar(self, formatter):
+        times = [0.0, 0.29, 2.5, 59.999, 3725.5, 36000.0]
+        assert formatter.format_times_srt(times) == [formatter.format_time_srt(t) for t in times]
@@ -0,0 +1,89 @@
+"""Tests for the shared Whisper model cache."""
+
+import threading
+
+import pytest
+
+from transcriber.config import settings
+from transcriber.services import whisper
+from transcriber.services.whisper import WhisperEngine, load_model
+
+
+class FakeWhisperModel:
+    """Stand-in for faster_whisper.WhisperModel that records loads instead of reading weights."""
+
+    loaded: list[str] = []
+    transcribe_calls = 0
+    # Model sizes whose load blocks until the matching event is set
+    gates: dict[str, threading.Event] = {}
+
+    def __init__(self, model_size, **kwargs):
+        gate = self.gates.get(model_size)
+        if gate is not None:
+            assert gate.wait(timeout=5)
+        self.model_size = model_size
+        FakeWhisperModel.loaded.append(model_size)
+
+    def transcribe(self, audio, **kwargs):
+        FakeWhisperModel.transcribe_calls += 1
+        return iter(()), None
+
+
+@pytest.fixture(autouse=True)
+def fake_model(monkeypatch):
+    monkeypatch.setattr(whisper, "WhisperModel", FakeWhisperModel)
+    monkeypatch.setattr(whisper, "_model_cache", type(whisper._model_cache)())
+    monkeypatch.setattr(whisper, "_model_load_locks", {})
+    FakeWhisperModel.loaded = []
+    FakeWhisperModel.transcribe_calls = 0
+    FakeWhisperModel.gates = {}
+
+
+class TestLoadModel:
+    def test_reuses_loaded_model(self):
+        first = load_model("tiny", "cpu", "int8")
+        assert load_model("tiny", "cpu", "int8") is first
+        assert FakeWhisperModel.loaded == ["tiny"]
+
+    def test_evicts_least_recently_used(self, monkeypatch):
+        monkeypatch.setattr(settings, "whisper_max_loaded_models", 2)
+
+        load_model("tiny", "cpu", "int8")
+        load_model("base", "cpu", "int8")
+        load_model("tiny", "cpu", "int8")  # base is now the oldest
+        load_model("small", "cpu", "int8")
+
+        assert list(whisper._model_cache) == [("tiny", "cpu", "int8"), ("small", "cpu", "int8")]
+        load_model("base", "cpu", "int8")
+        assert FakeWhisperModel.loaded == ["tiny", "base", "small", "base"]
+
+    def test_different_models_load_in_parallel(self):
+        gate = threading.Event()
+        FakeWhisperModel.gates["medium"] = gate
+        slow = threading.Thread(target=load_model, args=("medium", "cpu", "int8"))
+        slow.start()
+        try:
+            # Would deadlock if one lock covered every load
+            load_model("tiny", "cpu", "int8")
+            assert FakeWhisperModel.loaded == ["tiny"]
+        finally:
+            gate.set()
+            slow.join()
+        assert FakeWhisperModel.loaded == ["tiny", "medium"]
+
+    def test_warms_up_once_per_model(self, monkeypatch):
+        monkeypatch.setattr(settings, "whisper_preload", True)
+
+        load_model("tiny", "cpu", "int8")
+        load_model("tiny", "cpu", "int8")
+
+        assert FakeWhisperModel.transcribe_calls == 1
+
+    def test_engine_does_not_load_on_construction(self, monkeypatch):
+        monkeypatch.setattr(settings, "whisper_preload", True)
+
+        engine = WhisperEngine(model_size="tiny", device="cpu", compute_type="int8")
+
+        assert FakeWhisperModel.loaded == []
+        engine.load()
+        assert FakeWhisperModel.loaded == ["tiny"]
@@ -1,33 +1,157 @@
 """Tests for YouTube downloader."""
 
+import io
+import wave
+from pathlib import Path
+
 import pytest
+import yt_dlp
+from yt_dlp.networking import Response
+from yt_dlp.networking.exceptions import HTTPError
+
+from transcriber.services import youtube
+from transcriber.services.youtube import YouTubeDownloader, _ConcurrencyController
+
+
+class FakeYoutubeDL:
+    """Stand-in for yt_dlp.YoutubeDL that writes a local file instead of downloading."""
+
+    extract_calls = 0
+    instances = 0
+    sanitize_info = staticmethod(yt_dlp.YoutubeDL.sanitize_info)
+
+    def __init__(self, opts):
+        FakeYoutubeDL.instances += 1
+        self.opts = opts
+        self._progress_hooks = []
+
+    def add_progress_hook(self, hook):
+        self._progress_hooks.append(hook)
+
+    def close(self):
+        pass
+
+    def extract_info(self, url, download=False):
+        FakeYoutubeDL.extract_calls += 1
+        if self.opts.get("extract_flat") == "in_playlist":
+            entries = [{"id": "a", "title": "A", "duration": 1, "url": "https://youtu.be/a"}]
+            return {"_type": "playlist", "id": "PL1", "title": "List", "entries": entries}
+        video_id = url.split("&", 1)[0].rsplit("/", 1)[-1].rsplit("=", 1)[-1]
+        info = {"id": video_id, "title": "Fake: Title", "duration": 1}
+        return self.process_ie_result(info, download=download)
+
+    def process_ie_result(self, info, download=True):
+        if download:
+            path = Path(self.prepare_filename(info))
+            path.write_bytes(b"RIFF")
+            info["requested_downloads"] = [{"filepath": str(path)}]
+        return info
+
+    def prepare_filename(self, info):
+        return self.opts["outtmpl"].replace("%(id)s", info["id"]).replace("%(ext)s", "wav")
+
+
+class OfflineYoutubeDL(yt_dlp.YoutubeDL):
+    """Real YoutubeDL with a canned extractor result and no actual downloading."""
+
+    downloaded_formats: list[str] = []
+
+    def extract_info(self, url, download=True, *args, **kwargs):
+        info = {
+            "id": "dQw4w9WgXcQ",
+            "title": "Offline",
+            "extractor": "youtube",
+            "extractor_key": "Youtube",
+            "webpage_url": url,
+            "formats": [
+                {"format_id": "140", "ext": "m4a", "url": "https://example.invalid/140",
+                 "protocol": "https", "acodec": "mp4a.40.2", "vcodec": "none"},
+                {"format_id": "137", "ext": "mp4", "url": "https://example.invalid/137",
+                 "protocol": "https", "acodec": "none", "vcodec": "avc1.640028"},
+            ],
+        }
+        return self.process_ie_result(info, download=download)
+
+    def process_info(self, info_dict):
+        requested = info_dict.get("requested_formats") or [info_dict]
+        OfflineYoutubeDL.downloaded_formats = [f["format_id"] for f in requested]
+        path = Path(self.prepare_filename(info_dict)).with_suffix(".wav")
+        path.write_bytes(b"RIFF")
+        info_dict["filepath"] = str(path)
+
 
-from transcriber.services.youtube import YouTubeDownloader
+@pytest.fixture(autouse=True)
+def no_network(monkeypatch):
+    """Keep yt-dlp from touching the network in every test."""
+    monkeypatch.setattr(youtube.yt_dlp, "YoutubeDL", FakeYoutubeDL)
+    monkeypatch.setattr(FakeYoutubeDL, "extract_calls", 0)
+    monkeypatch.setattr(FakeYoutubeDL, "instances", 0)
+    monkeypatch.setattr(youtube, "_info_cache", {})
 
 
 @pytest.fixture
-def downloader():
-    return YouTubeDownloader()
+def downloader(tmp_path):
+    return YouTubeDownloader(output_dir=tmp_path)
+
+
+class FakeRangeServer:
+    """Serves ``data`` through ``ydl.urlopen``, honouring Range unless told otherwise."""
+
+    def __init__(self, data: bytes, honor_range: bool = True, max_range: int | None = None):
+        self.data = data
+        self.honor_range = honor_range
+        self.max_range = max_range
+        self.ranges: list[str] = []
+
+    def urlopen(self, request):
+        byte_range = request.headers["Range"]
+        self.ranges.append(byte_range)
+        if not self.honor_range:
+            return Response(io.BytesIO(self.data), request.url, {}, status=200)
+
+        start, end = (int(n) for n in byte_range.removeprefix("bytes=").split("-"))
+        if start >= len(self.data):
+            raise HTTPError(Response(io.BytesIO(b""), request.url, {}, status=416))
+        if self.max_range:
+            end = min(end, start + self.max_range - 1)
+        body = self.data[start:end + 1]
+        return Response(io.BytesIO(body), request.url, {}, status=206)
+
+
+def make_wav(size: int) -> bytes:
+    """A 16 kHz mono WAV of exactly ``size`` bytes (44-byte header included)."""
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(16000)
+        wav.writeframes(b"\x00\x01" * ((size - 44) // 2))
+    return buffer.getvalue()
 
 
 class TestYouTubeDownloader:
-    def test_is_youtube_url_valid_watch(self, downloader):
-        assert downloader.is_youtube_url("https://www.youtube.com/watch?v=dQw4w9WgXcQ")
-        assert downloader.is_youtube_url("https://youtube.com/watch?v=dQw4w9WgXcQ")
-        assert downloader.is_youtube_url("http://youtube.com/watch?v=dQw4w9WgXcQ")
-        assert downloader.is_youtube_url("www.youtube.com/watch?v=dQw4w9WgXcQ")
-        assert downloader.is_youtube_url("youtube.com/watch?v=dQw4w9WgXcQ")
-
-    def test_is_youtube_url_valid_short(self, downloader):
-        assert downloader.is_youtube_url("https://youtu.be/dQw4w9WgXcQ")
-        assert downloader.is_youtube_url("http://youtu.be/dQw4w9WgXcQ")
-        assert downloader.is_youtube_url("youtu.be/dQw4w9WgXcQ")
-
-    def test_is_youtube_url_invalid(self, downloader):
-        assert not downloader.is_youtube_url("https://google.com")
-        assert not downloader.is_youtube_url("https://vimeo.com/12345")
-        assert not downloader.is_youtube_url("not a url")
-        assert not downloader.is_youtube_url("")
+    @pytest.mark.parametrize(
+        "url",
+        [
+            "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+            "https://youtube.com/watch?v=dQw4w9WgXcQ",
+            "http://youtube.com/watch?v=dQw4w9WgXcQ",
+            "www.youtube.com/watch?v=dQw4w9WgXcQ",
+            "youtube.com/watch?v=dQw4w9WgXcQ",
+            "https://youtu.be/dQw4w9WgXcQ",
+            "http://youtu.be/dQw4w9WgXcQ",
+            "youtu.be/dQw4w9WgXcQ",
+        ],
+    )
+    def test_is_youtube_url_valid(self, downloader, url):
+        assert downloader.is_youtube_url(url)
+
+    @pytest.mark.parametrize(
+        "url",
+        ["https://google.com", "https://vimeo.com/12345", "not a url", ""],
+    )
+    def test_is_youtube_url_invalid(self, downloader, url):
+        assert not downloader.is_youtube_url(url)
 
     def test_extract_video_id_watch_url(self, downloader):
         url = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
@@ -52,3 +176,182 @@ class TestYouTubeDownloader:
     def test_download_invalid_url(self, downloader):
         with pytest.raises(ValueError, match="Invalid YouTube URL"):
             downloader.download("https://google.com")
+
+    def test_download_returns_file_and_title(self, downloader, tmp_path):
+        path, title = downloader.download("https://youtu.be/dQw4w9WgXcQ")
+        assert path == tmp_path / "dQw4w9WgXcQ.wav"
+        assert path.exists()
+        assert title == "Fake Title"
+
+    def test_download_many_keeps_url_order(self, downloader, tmp_path):
+        urls = ["https://youtu.be/first", "https://www.youtube.com/watch?v=second"]
+        results = downloader.download_many(urls, max_workers=2)
+        assert [path for path, _ in results] == [
+            tmp_path / "first.wav",
+            tmp_path / "second.wav",
+        ]
+
+    def test_download_reuses_fetched_info(self, downloader):
+        url = "https://youtu.be/dQw4w9WgXcQ"
+        assert downloader.get_video_info(url)["title"] == "Fake: Title"
+        downloader.get_video_info(url)
+        downloader.download(url)
+        assert FakeYoutubeDL.extract_calls == 1
+
+    def test_download_after_info_selects_audio_format_only(self, downloader, monkeypatch):
+        monkeypatch.setattr(youtube.yt_dlp, "YoutubeDL", OfflineYoutubeDL)
+        url = "https://youtu.be/dQw4w9WgXcQ"
+        downloader.get_video_info(url)
+        downloader.download(url)
+        assert OfflineYoutubeDL.downloaded_formats == ["140"]
+
+    def test_download_names_file_by_ytdlp_id(self, downloader, tmp_path, monkeypatch):
+        monkeypatch.setattr(youtube.yt_dlp, "YoutubeDL", OfflineYoutubeDL)
+        # The regex matches a longer ID than the one yt-dlp resolves
+        path, info = downloader.download_with_info(
+            "https://www.youtube.com/watch?v=dQw4w9WgXcQXYZ"
+        )
+        assert path == tmp_path / "dQw4w9WgXcQ.wav"
+        assert path.exists()
+        assert info["id"] == "dQw4w9WgXcQ"
+
+    def test_download_with_info_uses_single_extraction(self, downloader, tmp_path):
+        path, info = downloader.download_with_info("https://youtu.be/dQw4w9WgXcQ")
+        assert path == tmp_path / "dQw4w9WgXcQ.wav"
+        assert info["id"] == "dQw4w9WgXcQ"
+        assert info["title"] == "Fake: Title"
+        assert info["duration"] == 1
+        assert FakeYoutubeDL.extract_calls == 1
+
+    def test_get_video_info_lists_playlist_entries_flat(self, downloader):
+        info = downloader.get_video_info("https://www.youtube.com/watch?v=a&list=PL1")
+        assert info["id"] == "PL1"
+        assert info["entries"] == [
+            {"id": "a", "title": "A", "duration": 1, "url": "https://youtu.be/a"}
+        ]
+
+    async def test_adownload_many_keeps_url_order(self, downloader, tmp_path):
+        urls = ["https://youtu.be/first", "https://youtu.be/second", "https://youtu.be/third"]
+        results = await downloader.adownload_many(urls, limit=2)
+        assert [path.name for path, _ in results] == ["first.wav", "second.wav", "third.wav"]
+
+    def test_get_video_info_selected_fields(self, downloader):
+        info = downloader.get_video_info("https://youtu.be/dQw4w9WgXcQ", fields=("id", "title"))
+        assert info == {"id": "dQw4w9WgXcQ", "title": "Fake: Title"}
+
+    def test_sequential_downloads_reuse_pooled_instance(self, downloader):
+        downloader.download("https://youtu.be/first")
+        downloader.download("https://youtu.be/second")
+        assert FakeYoutubeDL.instances == 1
+
+    def test_download_converts_non_wav_into_place(self, downloader, tmp_path, monkeypatch):
+        def fake_prepare_filename(ydl, info):
+            return ydl.opts["outtmpl"].replace("%(id)s", info["id"]).replace("%(ext)s", "m4a")
+
+        def fake_extract_audio(extractor, source, target):
+            target.write_bytes(b"RIFF")
+            return target
+
+        monkeypatch.setattr(FakeYoutubeDL, "prepare_filename", fake_prepare_filename)
+        monkeypatch.setattr(youtube.AudioExtractor, "extract_audio", fake_extract_audio)
+
+        path, _ = downloader.download("https://youtu.be/dQw4w9WgXcQ")
+        assert path == tmp_path / "dQw4w9WgXcQ.wav"
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["dQw4w9WgXcQ.wav"]
+
+
+class TestStreamToWav:
+    CHUNK = 4096
+
+    @pytest.fixture(autouse=True)
+    def small_chunks(self, monkeypatch):
+        monkeypatch.setattr(youtube, "HTTP_CHUNK_SIZE", self.CHUNK)
+        monkeypatch.setattr(youtube, "STREAM_READ_SIZE", 1024)
+
+    def stream(self, downloader, server, output_path, **info):
+        progress = []
+        info = {"url": "https://example.com/audio", **info}
+        downloader._stream_to_wav(server, info, output_path, progress.append)
+        return progress
+
+    def test_fetches_ranged_chunks(self, downloader, tmp_path):
+        data = make_wav(3 * self.CHUNK + 100)
+        server = FakeRangeServer(data)
+        output_path = tmp_path / "out.wav"
+
+        progress = self.stream(downloader, server, output_path, filesize=len(data))
+
+        assert server.ranges == [
+            "bytes=0-4095", "bytes=4096-8191", "bytes=8192-12287", "bytes=12288-16383",
+        ]
+        assert progress[-1]["downloaded_bytes"] == len(data)
+        assert output_path.read_bytes()[:4] == b"RIFF"
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["out.wav"]
+
+    def test_server_ignoring_range_is_read_once(self, downloader, tmp_path):
+        data = make_wav(3 * self.CHUNK)
+        server = FakeRangeServer(data, honor_range=False)
+        output_path = tmp_path / "out.wav"
+
+        progress = self.stream(downloader, server, output_path)
+
+        assert server.ranges == ["bytes=0-4095"]
+        assert progress[-1]["downloaded_bytes"] == len(data)
+        assert output_path.exists()
+
+    def test_trailing_416_ends_download(self, downloader, tmp_path):
+        # Unknown size that is an exact multiple of the chunk: the last request is past the end
+        data = make_wav(2 * self.CHUNK)
+        server = FakeRangeServer(data)
+        output_path = tmp_path / "out.wav"
+
+        self.stream(downloader, server, output_path)
+
+        assert server.ranges == ["bytes=0-4095", "bytes=4096-8191", "bytes=8192-12287"]
+        assert output_path.exists()
+
+    def test_known_size_keeps_going_past_capped_ranges(self, downloader, tmp_path):
+        data = make_wav(2 * self.CHUNK)
+        server = FakeRangeServer(data, max_range=1024)
+        output_path = tmp_path / "out.wav"
+
+        progress = self.stream(downloader, server, output_path, filesize=len(data))
+
+        assert len(server.ranges) == 8
+        assert progress[-1]["downloaded_bytes"] == len(data)
+        assert output_path.exists()
+
+    def test_server_stopping_early_fails(self, downloader, tmp_path):
+        data = make_wav(2 * self.CHUNK)
+        server = FakeRangeServer(data)
+
+        with pytest.raises(RuntimeError, match="ended early"):
+            self.stream(downloader, server, tmp_path / "out.wav", filesize=len(data) + 100)
+
+        assert list(tmp_path.iterdir()) == []
+
+    def test_ffmpeg_failure_leaves_no_files(self, downloader, tmp_path):
+        server = FakeRangeServer(b"not audio" * 100)
+
+        with pytest.raises(RuntimeError, match="FFmpeg failed"):
+            self.stream(downloader, server, tmp_path / "out.wav")
+
+        assert list(tmp_path.iterdir()) == []
+
+
+class TestConcurrencyController:
+    def test_grows_while_throughput_rises(self):
+        controller = _ConcurrencyController(cap=4)
+        assert controller.limit == 2
+        assert controller.update(1.0) == 3
+        assert controller.update(2.0) == 4
+        assert controller.update(3.0) == 4
+
+    def test_backs_off_after_three_low_samples(self):
+        controller = _ConcurrencyController(cap=4)
+        controller.update(10.0)
+        assert controller.update(5.0) == 3
+        assert controller.update(5.0) == 3
+        assert controller.update(5.0) == 2
+        # The lower level becomes the new baseline
+        assert controller.update(6.0) == 3
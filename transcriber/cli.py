@@ -1,15 +1,13 @@
 from __future__ import annotations
 """Command-line interface for video transcriber."""
 
-import re
 from pathlib import Path
 from typing import Annotated, Optional
 
 import typer
 from rich.console import Console
-from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
 
-from transcriber.config import settings
+from transcriber.services.youtube_patterns import is_youtube_url
 
 app = typer.Typer(
     name="transcribe",
@@ -19,15 +17,6 @@ app = typer.Typer(
 console = Console()
 
 
-def is_youtube_url(text: str) -> bool:
-    """Check if text is a YouTube URL."""
-    youtube_patterns = [
-        r"(https?://)?(www\.)?youtube\.com/watch\?v=[\w-]+",
-        r"(https?://)?(www\.)?youtu\.be/[\w-]+",
-    ]
-    return any(re.match(pattern, text) for pattern in youtube_patterns)
-
-
 @app.command()
 def transcribe(
     source: Annotated[str, typer.Argument(help="Video file path or YouTube URL")],
@@ -60,8 +49,6 @@ def transcribe(
         transcribe https://youtube.com/watch?v=xxx
         transcribe video.mp4 --lang ru --model medium
     """
-    from transcriber.services.transcription import TranscriptionService
-
     # Check if YouTube URL
     if is_youtube_url(source):
         _transcribe_youtube(
@@ -95,6 +82,8 @@ def _transcribe_file(
     format_llm: bool,
 ):
     """Transcribe a local video file."""
+    from rich.progress import BarColumn, Progress, SpinnerColumn, TaskProgressColumn, TextColumn
+
     from transcriber.services.transcription import TranscriptionService
 
     if not file_path.exists():
@@ -160,6 +149,8 @@ def _transcribe_youtube(
     format_llm: bool,
 ):
     """Transcribe a YouTube video."""
+    from rich.progress import BarColumn, Progress, SpinnerColumn, TaskProgressColumn, TextColumn
+
     from transcriber.services.youtube import YouTubeDownloader
     from transcriber.services.transcription import TranscriptionService
 
@@ -222,8 +213,7 @@ def _transcribe_youtube(
 
         finally:
             # Cleanup downloaded video
-            if video_path.exists():
-                video_path.unlink()
+            video_path.unlink(missing_ok=True)
 
 
 @app.command()
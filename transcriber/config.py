@@ -1,6 +1,7 @@
 from __future__ import annotations
 """Application configuration using pydantic-settings."""
 
+from functools import cached_property
 from pathlib import Path
 from typing import Literal
 
@@ -20,6 +21,19 @@ class Settings(BaseSettings):
     whisper_model: Literal["tiny", "base", "small", "medium", "large-v3"] = "medium"
     whisper_device: Literal["auto", "cpu", "cuda"] = "auto"
     whisper_compute_type: Literal["auto", "int8", "float16", "float32"] = "auto"
+    # Parallel transcribe() calls a single loaded model can serve
+    whisper_num_workers: int = 1
+    # Models kept loaded at once; each size takes up to several GB
+    whisper_max_loaded_models: int = 1
+    # Warm the default model up at server start and each model once after loading
+    whisper_preload: bool = False
+
+    # YouTube
+    youtube_max_workers: int = 4  # parallel downloads in download_many
+    youtube_fragment_downloads: int = 5  # parallel fragments per download
+    youtube_info_ttl: int = 300  # seconds to reuse fetched video metadata
+    # Pipe non-fragmented audio straight into FFmpeg instead of saving it first
+    youtube_stream_audio: bool = False
 
     # Storage
     data_dir: Path = Path.home() / ".video-transcriber"
@@ -43,16 +57,16 @@ class Settings(BaseSettings):
         if not self.database_url:
             self.database_url = f"sqlite+aiosqlite:///{self.data_dir}/transcriptions.db"
 
-    @property
+    @cached_property
     def uploads_dir(self) -> Path:
-        """Directory for uploaded files."""
+        """Directory for uploaded files (created on first access)."""
         path = self.data_dir / "uploads"
         path.mkdir(parents=True, exist_ok=True)
         return path
 
-    @property
+    @cached_property
     def temp_dir(self) -> Path:
-        """Directory for temporary files."""
+        """Directory for temporary files (created on first access)."""
         path = self.data_dir / "temp"
         path.mkdir(parents=True, exist_ok=True)
         return path
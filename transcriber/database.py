@@ -4,17 +4,43 @@ from __future__ import annotations
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from transcriber.config import settings
 from transcriber.models import Base
 
+_is_sqlite = settings.database_url.startswith("sqlite")
+
+# In-memory SQLite uses a single static connection, so pool sizing does not apply
+_pool_options = (
+    {}
+    if ":memory:" in settings.database_url
+    else {"pool_size": 10, "max_overflow": 20, "pool_recycle": 1800}
+)
+
 # Create async engine
 engine = create_async_engine(
     settings.database_url,
     echo=False,
+    pool_pre_ping=True,
+    connect_args={"check_same_thread": False} if _is_sqlite else {},
+    **_pool_options,
 )
 
+if _is_sqlite:
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        """Enable WAL, foreign keys and relaxed fsyncs on every new SQLite connection."""
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA cache_size=-65536")
+        cursor.close()
+
 # Session factory
 async_session_maker = async_sessionmaker(
     engine,
@@ -39,3 +65,14 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
         except Exception:
             await session.rollback()
             raise
+
+
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Yield a database session for FastAPI dependency injection.
+
+    Cleanup after ``yield`` runs once the response has been sent, so handlers
+    that write must commit themselves before returning.
+    """
+    async with get_session() as session:
+        yield session
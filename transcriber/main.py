@@ -2,33 +2,91 @@ from __future__ import annotations
 """FastAPI web application for video transcription."""
 
 import asyncio
-import json
 import shutil
+import threading
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from functools import lru_cache
 from pathlib import Path
-from typing import Annotated, Dict, List, Optional
+from typing import Annotated, BinaryIO, Dict, Iterable, Iterator, List, Optional
 from uuid import uuid4
 
-from fastapi import BackgroundTasks, FastAPI, File, Form, HTTPException, UploadFile
+import orjson
+from fastapi import BackgroundTasks, Depends, FastAPI, File, Form, HTTPException, UploadFile
 from fastapi.responses import FileResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
 from sse_starlette.sse import EventSourceResponse
 
 from transcriber.config import settings
-from transcriber.database import get_session, init_db
+from transcriber.database import get_db, get_session, init_db
 from transcriber.models import Segment, Transcription, TranscriptionStatus
 from transcriber.services.formatter import OutputFormatter
 from transcriber.services.transcription import TranscriptionService
+from transcriber.services.whisper import WhisperEngine
 from transcriber.services.youtube import YouTubeDownloader
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Initialize database on startup."""
+    await init_db()
+    if settings.whisper_preload:
+        # Load and warm up the default model before the first job asks for it
+        threading.Thread(target=WhisperEngine().load, daemon=True).start()
+    yield
+
+
 app = FastAPI(
     title="Video Transcriber",
     description="Transcribe video files using Whisper",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
-# Progress tracking for SSE
-progress_store: Dict[str, Dict] = {}
+# Buffer size for writing uploaded files to disk
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+# Approximate size of each chunk sent for streamed downloads
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# Progress tracking for SSE, bounded so finished jobs don't accumulate forever
+PROGRESS_STORE_MAX_SIZE = 1024
+progress_store: OrderedDict[str, Dict] = OrderedDict()
+# Per-transcription events, swapped out and set on every progress update
+progress_events: Dict[str, asyncio.Event] = {}
+
+
+def _notify_progress(transcription_id: str):
+    """Wake SSE streams waiting on a transcription's progress."""
+    event = progress_events.pop(transcription_id, None)
+    if event:
+        event.set()
+
+
+def publish_progress(transcription_id: str, data: Dict):
+    """Store progress and wake its SSE subscribers (must run on the event loop)."""
+    progress_store[transcription_id] = data
+    progress_store.move_to_end(transcription_id)
+    _notify_progress(transcription_id)
+
+    # Evict the least recently updated entries
+    while len(progress_store) > PROGRESS_STORE_MAX_SIZE:
+        evicted_id, _ = progress_store.popitem(last=False)
+        _notify_progress(evicted_id)
+
+
+@lru_cache(maxsize=1)
+def get_service() -> TranscriptionService:
+    """Shared service for read-only endpoints (model settings are irrelevant there)."""
+    return TranscriptionService()
+
+
+@lru_cache(maxsize=1)
+def get_formatter() -> OutputFormatter:
+    """Shared stateless output formatter."""
+    return OutputFormatter()
 
 
 # Pydantic models for API
@@ -68,12 +126,6 @@ class TranscriptionListResponse(BaseModel):
     items: List[TranscriptionListItem]
 
 
-@app.on_event("startup")
-async def startup():
-    """Initialize database on startup."""
-    await init_db()
-
-
 # Mount static files
 static_dir = Path(__file__).parent / "static"
 if static_dir.exists():
@@ -99,6 +151,7 @@ async def create_transcription(
     output_format: str = Form("md"),
     include_timestamps: bool = Form(False),
     llm_format: bool = Form(False),
+    session: AsyncSession = Depends(get_db),
 ):
     """
     Create a new transcription job.
@@ -108,57 +161,64 @@ async def create_transcription(
     if not file and not youtube_url:
         raise HTTPException(400, "Either file or youtube_url is required")
 
-    async with get_session() as session:
-        service = TranscriptionService(whisper_model=model, language=language)
-
-        if file:
-            # Handle file upload
-            source_type = "file"
-            source_name = file.filename or "uploaded_file"
-
-            # Save uploaded file
-            file_id = str(uuid4())
-            upload_path = settings.uploads_dir / f"{file_id}_{source_name}"
-
-            with open(upload_path, "wb") as f:
-                shutil.copyfileobj(file.file, f)
-
-        else:
-            # Handle YouTube URL
-            source_type = "youtube"
-            source_name = youtube_url
-            upload_path = None
-
-        # Create database record
-        transcription = await service.create_transcription(
-            session=session,
-            source_type=source_type,
-            source_name=source_name,
-            language=language,
-            model=model,
-        )
-
-        # Initialize progress tracking
-        progress_store[transcription.id] = {"progress": 0, "status": "pending"}
-
-        # Start background processing
-        background_tasks.add_task(
-            process_transcription_task,
-            transcription_id=transcription.id,
-            source_type=source_type,
-            source_path=upload_path,
-            youtube_url=youtube_url,
-            model=model,
-            language=language,
-            include_timestamps=include_timestamps,
-            llm_format=llm_format,
-        )
-
-        return TranscriptionResponse(
-            id=transcription.id,
-            status=transcription.status,
-            progress=0,
-        )
+    service = TranscriptionService(whisper_model=model, language=language)
+
+    if file:
+        # Handle file upload
+        source_type = "file"
+        source_name = file.filename or "uploaded_file"
+
+        # Save uploaded file
+        file_id = str(uuid4())
+        upload_path = settings.uploads_dir / f"{file_id}_{source_name}"
+
+        await asyncio.to_thread(_save_upload, file.file, upload_path)
+
+    else:
+        # Handle YouTube URL
+        source_type = "youtube"
+        source_name = youtube_url
+        upload_path = None
+
+    # Create database record
+    transcription = await service.create_transcription(
+        session=session,
+        source_type=source_type,
+        source_name=source_name,
+        language=language,
+        model=model,
+    )
+
+    # Persist the record before the background task looks it up
+    await session.commit()
+
+    # Initialize progress tracking
+    publish_progress(transcription.id, {"progress": 0, "status": "pending"})
+
+    # Start background processing
+    background_tasks.add_task(
+        process_transcription_task,
+        transcription_id=transcription.id,
+        source_type=source_type,
+        source_path=upload_path,
+        youtube_url=youtube_url,
+        model=model,
+        language=language,
+        include_timestamps=include_timestamps,
+        llm_format=llm_format,
+    )
+
+    return TranscriptionResponse(
+        id=transcription.id,
+        status=transcription.status,
+        progress=0,
+    )
+
+
+def _save_upload(source: BinaryIO, destination: Path):
+    """Copy an uploaded file to disk (run in a worker thread)."""
+    with open(destination, "wb") as f:
+        shutil.copyfileobj(source, f, UPLOAD_CHUNK_SIZE)
 
 
 async def process_transcription_task(
@@ -172,21 +232,33 @@ async def process_transcription_task(
     llm_format: bool,
 ):
     """Background task to process transcription."""
+    loop = asyncio.get_running_loop()
+
     try:
         service = TranscriptionService(whisper_model=model, language=language)
 
         def update_progress(progress: int, status: str):
-            progress_store[transcription_id] = {"progress": progress, "status": status}
+            # Called from the Whisper worker thread as well as the event loop;
+            # on the loop, publish now so later direct writes keep their order
+            data = {"progress": progress, "status": status}
+            try:
+                on_loop = asyncio.get_running_loop() is loop
+            except RuntimeError:
+                on_loop = False
+            if on_loop:
+                publish_progress(transcription_id, data)
+            else:
+                loop.call_soon_threadsafe(publish_progress, transcription_id, data)
 
         # Download YouTube video if needed
         if source_type == "youtube" and youtube_url:
             update_progress(5, "downloading")
             downloader = YouTubeDownloader()
-            source_path, title = downloader.download(youtube_url)
+            source_path, title = await downloader.adownload(youtube_url)
 
             # Update source name in database
             async with get_session() as session:
-                transcription = await service.get_transcription(session, transcription_id)
+                transcription = await session.get(Transcription, transcription_id)
                 if transcription:
                     transcription.source_name = title
 
@@ -201,31 +273,35 @@ async def process_transcription_task(
         )
 
     except Exception as e:
-        progress_store[transcription_id] = {"progress": 0, "status": "failed", "error": str(e)}
+        publish_progress(
+            transcription_id, {"progress": 0, "status": "failed", "error": str(e)}
+        )
 
         async with get_session() as session:
-            transcription = await service.get_transcription(session, transcription_id)
+            transcription = await session.get(Transcription, transcription_id)
             if transcription:
                 transcription.status = TranscriptionStatus.FAILED.value
                 transcription.error_message = str(e)
 
     finally:
         # Cleanup uploaded file
-        if source_path and source_path.exists() and "uploads" in str(source_path):
-            source_path.unlink()
+        if source_path and "uploads" in str(source_path):
+            source_path.unlink(missing_ok=True)
 
 
 @app.get("/api/transcriptions/{transcription_id}", response_model=TranscriptionResponse)
-async def get_transcription(transcription_id: str):
+async def get_transcription(
+    transcription_id: str,
+    session: AsyncSession = Depends(get_db),
+    service: TranscriptionService = Depends(get_service),
+):
     """Get transcription status and result."""
-    async with get_session() as session:
-        service = TranscriptionService()
-        transcription = await service.get_transcription(session, transcription_id)
+    transcription = await service.get_transcription(session, transcription_id)
 
-        if not transcription:
-            raise HTTPException(404, "Transcription not found")
+    if not transcription:
+        raise HTTPException(404, "Transcription not found")
 
-        return TranscriptionResponse(**transcription.to_dict())
+    return TranscriptionResponse(**transcription.to_dict())
 
 
 @app.get("/api/transcriptions/{transcription_id}/events")
@@ -234,24 +310,35 @@ async def transcription_events(transcription_id: str):
 
     async def event_generator():
         last_progress = -1
-        while True:
-            if transcription_id in progress_store:
-                data = progress_store[transcription_id]
-                if data["progress"] != last_progress or data["status"] in ("completed", "failed"):
-                    yield {
-                        "event": "progress",
-                        "data": json.dumps({
-                            "progress": data["progress"],
-                            "status": data["status"],
-                            "error": data.get("error"),
-                        }),
-                    }
-                    last_progress = data["progress"]
-
-                    if data["status"] in ("completed", "failed"):
-                        break
-
-            await asyncio.sleep(0.5)
+        try:
+            while True:
+                if transcription_id in progress_store:
+                    data = progress_store[transcription_id]
+                    finished = data["status"] in ("completed", "failed")
+                    if data["progress"] != last_progress or finished:
+                        yield {
+                            "event": "progress",
+                            "data": orjson.dumps({
+                                "progress": data["progress"],
+                                "status": data["status"],
+                                "error": data.get("error"),
+                            }).decode(),
+                        }
+                        last_progress = data["progress"]
+
+                        if finished:
+                            break
+                        # An update may have arrived while yielding; read again
+                        continue
+
+                # Nothing new: wait, with no await between the read above and here
+                event = progress_events.setdefault(transcription_id, asyncio.Event())
+                await event.wait()
+        finally:
+            # No more updates will come to wake this event, so nobody else needs it
+            data = progress_store.get(transcription_id)
+            if data is None or data["status"] in ("completed", "failed"):
+                progress_events.pop(transcription_id, None)
 
     return EventSourceResponse(event_generator())
 
@@ -260,71 +347,98 @@ async def transcription_events(transcription_id: str):
 async def download_transcription(
     transcription_id: str,
     format: str = "md",
+    session: AsyncSession = Depends(get_db),
+    service: TranscriptionService = Depends(get_service),
+    formatter: OutputFormatter = Depends(get_formatter),
 ):
     """Download transcription as file."""
-    async with get_session() as session:
-        service = TranscriptionService()
-        transcription = await service.get_transcription(session, transcription_id)
-
-        if not transcription:
-            raise HTTPException(404, "Transcription not found")
-
-        if transcription.status != TranscriptionStatus.COMPLETED.value:
-            raise HTTPException(400, "Transcription not completed")
-
-        formatter = OutputFormatter()
-        segments = [Segment(**s) for s in transcription.segments]
-
-        if format == "srt":
-            content = formatter.to_srt(segments)
-            media_type = "text/plain"
-            filename = f"{transcription.source_name}.srt"
-        else:
-            content = formatter.to_markdown(segments, include_timestamps=True)
-            media_type = "text/markdown"
-            filename = f"{transcription.source_name}.md"
-
-        return StreamingResponse(
-            iter([content]),
-            media_type=media_type,
-            headers={"Content-Disposition": f'attachment; filename="{filename}"'},
-        )
+    transcription = await service.get_transcription(session, transcription_id)
+
+    if not transcription:
+        raise HTTPException(404, "Transcription not found")
+
+    if transcription.status != TranscriptionStatus.COMPLETED.value:
+        raise HTTPException(400, "Transcription not completed")
+
+    segments = [Segment(**s) for s in transcription.segments]
+
+    if format == "srt":
+        content = formatter.iter_srt(segments)
+        media_type = "text/plain"
+        filename = f"{transcription.source_name}.srt"
+    else:
+        content = formatter.iter_markdown(segments, include_timestamps=True)
+        media_type = "text/markdown"
+        filename = f"{transcription.source_name}.md"
+
+    return StreamingResponse(
+        _batch_text(content),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+def _batch_text(parts: Iterable[str], size: int = DOWNLOAD_CHUNK_SIZE) -> Iterator[str]:
+    """
+    Join small text parts into chunks of about ``size`` characters.
+
+    Starlette runs sync iterators in a thread pool, one hop and one send per
+    item, so per-cue items would make large downloads very slow.
+    """
+    batch: list[str] = []
+    length = 0
+    for part in parts:
+        batch.append(part)
+        length += len(part)
+        if length >= size:
+            yield "".join(batch)
+            batch = []
+            length = 0
+    if batch:
+        yield "".join(batch)
 
 
 @app.get("/api/transcriptions", response_model=TranscriptionListResponse)
-async def list_transcriptions():
+async def list_transcriptions(
+    session: AsyncSession = Depends(get_db),
+    service: TranscriptionService = Depends(get_service),
+):
     """List all transcriptions."""
-    async with get_session() as session:
-        service = TranscriptionService()
-        transcriptions = await service.list_transcriptions(session)
-
-        return TranscriptionListResponse(
-            items=[
-                TranscriptionListItem(
-                    id=t.id,
-                    source_name=t.source_name,
-                    source_type=t.source_type,
-                    status=t.status,
-                    created_at=t.created_at.isoformat(),
-                    duration_seconds=t.duration_seconds,
-                )
-                for t in transcriptions
-            ]
-        )
+    transcriptions = await service.list_transcriptions(session)
+
+    return TranscriptionListResponse(
+        items=[
+            TranscriptionListItem(
+                id=t.id,
+                source_name=t.source_name,
+                source_type=t.source_type,
+                status=t.status,
+                created_at=t.created_at.isoformat(),
+                duration_seconds=t.duration_seconds,
+            )
+            for t in transcriptions
+        ]
+    )
 
 
 @app.delete("/api/transcriptions/{transcription_id}")
-async def delete_transcription(transcription_id: str):
+async def delete_transcription(
+    transcription_id: str,
+    session: AsyncSession = Depends(get_db),
+    service: TranscriptionService = Depends(get_service),
+):
     """Delete a transcription."""
-    async with get_session() as session:
-        service = TranscriptionService()
-        deleted = await service.delete_transcription(session, transcription_id)
+    deleted = await service.delete_transcription(session, transcription_id)
+
+    if not deleted:
+        raise HTTPException(404, "Transcription not found")
 
-        if not deleted:
-            raise HTTPException(404, "Transcription not found")
+    # Commit before responding, so a failed delete surfaces as an error
+    await session.commit()
 
-        # Clean up progress store
-        if transcription_id in progress_store:
-            del progress_store[transcription_id]
+    # Clean up progress store
+    if transcription_id in progress_store:
+        del progress_store[transcription_id]
+    _notify_progress(transcription_id)
 
-        return {"message": "Deleted"}
+    return {"message": "Deleted"}
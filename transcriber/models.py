@@ -1,15 +1,15 @@
 from __future__ import annotations
 """Database models for transcriptions."""
 
-import json
 from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
 from typing import Dict, List, Literal, Optional
 from uuid import uuid4
 
-from sqlalchemy import DateTime, Integer, String, Text
-from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+import orjson
+from sqlalchemy import DateTime, Float, ForeignKey, Integer, String, Text
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 
 class Base(DeclarativeBase):
@@ -46,7 +46,14 @@ class Transcription(Base):
 
     # Result
     text: Mapped[str] = mapped_column(Text, default="")
+    # Legacy storage; segments now live in transcription_segments
     segments_json: Mapped[str] = mapped_column(Text, default="[]")
+    segments_rel: Mapped[List[TranscriptionSegment]] = relationship(
+        order_by="TranscriptionSegment.idx",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy="raise",
+    )
 
     # Status
     status: Mapped[str] = mapped_column(
@@ -57,13 +64,23 @@ class Transcription(Base):
 
     @property
     def segments(self) -> List[Dict]:
-        """Parse segments from JSON."""
-        return json.loads(self.segments_json) if self.segments_json else []
+        """
+        Segments as dicts (requires ``segments_rel`` to be loaded).
+
+        Rows saved before the segments table existed fall back to ``segments_json``.
+        """
+        if self.segments_rel:
+            return [segment.to_dict() for segment in self.segments_rel]
+        return orjson.loads(self.segments_json) if self.segments_json else []
 
     @segments.setter
     def segments(self, value: List[Dict]):
-        """Serialize segments to JSON."""
-        self.segments_json = json.dumps(value, ensure_ascii=False)
+        """Replace segments with rows built from dicts."""
+        self.segments_rel = [
+            TranscriptionSegment(idx=i, start=s["start"], end=s["end"], text=s["text"])
+            for i, s in enumerate(value)
+        ]
+        self.segments_json = "[]"
 
     def to_dict(self) -> dict:
         """Convert to dictionary for API responses."""
@@ -83,13 +100,38 @@ class Transcription(Base):
         }
 
 
+class TranscriptionSegment(Base):
+    """One timed segment of a transcription."""
+
+    __tablename__ = "transcription_segments"
+
+    # The composite primary key doubles as the (transcription_id, idx) index
+    transcription_id: Mapped[str] = mapped_column(
+        String(36),
+        ForeignKey("transcriptions.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    idx: Mapped[int] = mapped_column(Integer, primary_key=True)
+    start: Mapped[float] = mapped_column(Float)
+    end: Mapped[float] = mapped_column(Float)
+    text: Mapped[str] = mapped_column(Text)
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary."""
+        return {"start": self.start, "end": self.end, "text": self.text}
+
+
 @dataclass
 class Segment:
     """A transcription segment with timing."""
 
     start: float  # seconds
     end: float  # seconds
-    text: str
+    text: str  # stripped of surrounding whitespace
+
+    if __debug__:
+        def __post_init__(self):
+            assert self.text == self.text.strip(), "Segment text must be stripped"
 
     def to_dict(self) -> dict:
         """Convert to dictionary."""
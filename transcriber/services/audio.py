@@ -2,18 +2,25 @@ from __future__ import annotations
 """Audio extraction from video files using FFmpeg."""
 
 import subprocess
+from functools import lru_cache
 from pathlib import Path
 
 import imageio_ffmpeg
+import numpy as np
 
 from transcriber.config import settings
 
+# Sample rate expected by Whisper
+SAMPLE_RATE = 16000
 
+
+@lru_cache(maxsize=1)
 def get_ffmpeg_path() -> str:
     """Get path to FFmpeg executable (bundled with imageio-ffmpeg)."""
     return imageio_ffmpeg.get_ffmpeg_exe()
 
 
+@lru_cache(maxsize=1)
 def get_ffprobe_path() -> str:
     """Get path to FFprobe executable."""
     # imageio-ffmpeg bundles ffmpeg, ffprobe is in the same directory
@@ -38,6 +45,14 @@ class AudioExtractor:
         """Check if file format is supported."""
         return path.suffix.lower() in self.SUPPORTED_FORMATS
 
+    def check_supported(self, path: Path):
+        """Raise ValueError if the file format is not supported."""
+        if not self.is_supported(path):
+            raise ValueError(
+                f"Unsupported format: {path.suffix}. "
+                f"Supported: {', '.join(self.SUPPORTED_FORMATS)}"
+            )
+
     def extract_audio(self, video_path: Path, output_path: Path | None = None) -> Path:
         """
         Extract audio from video file as WAV.
@@ -52,11 +67,7 @@ class AudioExtractor:
         if not video_path.exists():
             raise FileNotFoundError(f"Video file not found: {video_path}")
 
-        if not self.is_supported(video_path):
-            raise ValueError(
-                f"Unsupported format: {video_path.suffix}. "
-                f"Supported: {', '.join(self.SUPPORTED_FORMATS)}"
-            )
+        self.check_supported(video_path)
 
         # Default output path in temp directory
         if output_path is None:
@@ -73,6 +84,8 @@ class AudioExtractor:
         # -ac 1: mono
         cmd = [
             self.ffmpeg,
+            "-hide_banner",
+            "-loglevel", "error",
             "-i", str(video_path),
             "-vn",
             "-acodec", "pcm_s16le",
@@ -82,17 +95,51 @@ class AudioExtractor:
             str(output_path),
         ]
 
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-        )
+        result = subprocess.run(cmd, capture_output=True)
 
         if result.returncode != 0:
-            raise RuntimeError(f"FFmpeg failed: {result.stderr}")
+            raise RuntimeError(f"FFmpeg failed: {result.stderr.decode('utf-8', 'replace')}")
 
         return output_path
 
+    def extract_audio_array(self, video_path: Path) -> np.ndarray:
+        """
+        Decode audio from a video file straight into memory.
+
+        FFmpeg writes raw 16 kHz mono float32 samples to a pipe, which is the
+        input format faster-whisper expects, so no temporary WAV is written.
+
+        Args:
+            video_path: Path to video file
+
+        Returns:
+            1-D float32 array of audio samples
+        """
+        if not video_path.exists():
+            raise FileNotFoundError(f"Video file not found: {video_path}")
+
+        self.check_supported(video_path)
+
+        # -f f32le: raw 32-bit float PCM to stdout
+        cmd = [
+            self.ffmpeg,
+            "-hide_banner",
+            "-loglevel", "error",
+            "-i", str(video_path),
+            "-vn",
+            "-f", "f32le",
+            "-ar", str(SAMPLE_RATE),
+            "-ac", "1",
+            "pipe:1",
+        ]
+
+        result = subprocess.run(cmd, capture_output=True)
+
+        if result.returncode != 0:
+            raise RuntimeError(f"FFmpeg failed: {result.stderr.decode('utf-8', 'replace')}")
+
+        return np.frombuffer(result.stdout, dtype=np.float32)
+
     def get_duration(self, path: Path) -> float:
         """Get duration of audio/video file in seconds."""
         cmd = [
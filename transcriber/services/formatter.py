@@ -1,30 +1,65 @@
 from __future__ import annotations
 """Output formatting for transcriptions."""
 
+from typing import Iterable, Iterator, Sequence
+
+import numpy as np
+
 from transcriber.models import Segment
 
 
+# Zero-padded field lookups for timestamp formatting
+_D2 = tuple(f"{i:02d}" for i in range(100))
+_D3 = tuple(f"{i:03d}" for i in range(1000))
+
+
+def _hours(hours: int) -> str:
+    """Zero-padded hours (tables only cover up to 99)."""
+    return _D2[hours] if hours < 100 else str(hours)
+
+
+# Last characters that close a sentence ("..." is covered by ".")
+_SENTENCE_ENDS = frozenset(".!?。")
+
+
+def _ends_sentence(text: str) -> bool:
+    """Check if already stripped segment text ends with sentence punctuation."""
+    return text[-1:] in _SENTENCE_ENDS
+
+
 class OutputFormatter:
     """Format transcription output to various formats."""
 
     @staticmethod
     def format_time_md(seconds: float) -> str:
         """Format seconds to HH:MM:SS for markdown."""
-        hours = int(seconds // 3600)
-        minutes = int((seconds % 3600) // 60)
-        secs = int(seconds % 60)
-        if hours > 0:
-            return f"{hours:02d}:{minutes:02d}:{secs:02d}"
-        return f"{minutes:02d}:{secs:02d}"
+        minutes, secs = divmod(int(seconds), 60)
+        hours, minutes = divmod(minutes, 60)
+        if hours:
+            return f"{_hours(hours)}:{_D2[minutes]}:{_D2[secs]}"
+        return f"{_D2[minutes]}:{_D2[secs]}"
 
     @staticmethod
     def format_time_srt(seconds: float) -> str:
         """Format seconds to HH:MM:SS,mmm for SRT."""
-        hours = int(seconds // 3600)
-        minutes = int((seconds % 3600) // 60)
-        secs = int(seconds % 60)
-        millis = int((seconds % 1) * 1000)
-        return f"{hours:02d}:{minutes:02d}:{secs:02d},{millis:03d}"
+        secs, millis = divmod(int(seconds * 1000), 1000)
+        minutes, secs = divmod(secs, 60)
+        hours, minutes = divmod(minutes, 60)
+        return f"{_hours(hours)}:{_D2[minutes]}:{_D2[secs]},{_D3[millis]}"
+
+    @staticmethod
+    def format_times_srt(seconds: Sequence[float]) -> list[str]:
+        """Format many timestamps to HH:MM:SS,mmm for SRT in one vectorized pass."""
+        millis = (np.asarray(seconds, dtype=np.float64) * 1000).astype(np.int64)
+        secs, millis = np.divmod(millis, 1000)
+        minutes, secs = np.divmod(secs, 60)
+        hours, minutes = np.divmod(minutes, 60)
+        return [
+            f"{_hours(h)}:{_D2[m]}:{_D2[s]},{_D3[ms]}"
+            for h, m, s, ms in zip(
+                hours.tolist(), minutes.tolist(), secs.tolist(), millis.tolist()
+            )
+        ]
 
     def to_markdown(
         self,
@@ -43,34 +78,50 @@ class OutputFormatter:
         Returns:
             Markdown formatted string
         """
-        lines = []
+        return "".join(self.iter_markdown(segments, include_timestamps, title)).strip()
+
+    def iter_markdown(
+        self,
+        segments: Iterable[Segment],
+        include_timestamps: bool = False,
+        title: str | None = None,
+    ) -> Iterator[str]:
+        """
+        Format segments as Markdown, yielding one paragraph at a time.
+
+        Args:
+            segments: Transcription segments
+            include_timestamps: Whether to include timestamps
+            title: Optional title for the document
+
+        Yields:
+            Markdown chunks; joined they form the document
+        """
+        separator = ""
 
         if title:
-            lines.append(f"# {title}")
-            lines.append("")
+            yield f"# {title}"
+            separator = "\n\n"
 
         if include_timestamps:
             for segment in segments:
                 timestamp = self.format_time_md(segment.start)
-                lines.append(f"**[{timestamp}]** {segment.text}")
-                lines.append("")
+                yield f"{separator}**[{timestamp}]** {segment.text}"
+                separator = "\n\n"
         else:
             # Group segments into paragraphs (by sentence endings)
             current_paragraph = []
             for segment in segments:
                 current_paragraph.append(segment.text)
                 # Start new paragraph after sentence-ending punctuation
-                if segment.text.rstrip().endswith((".", "!", "?", "...", "。")):
-                    lines.append(" ".join(current_paragraph))
-                    lines.append("")
+                if _ends_sentence(segment.text):
+                    yield separator + " ".join(current_paragraph)
+                    separator = "\n\n"
                     current_paragraph = []
 
             # Add remaining text
             if current_paragraph:
-                lines.append(" ".join(current_paragraph))
-                lines.append("")
-
-        return "\n".join(lines).strip()
+                yield separator + " ".join(current_paragraph)
 
     def to_srt(self, segments: list[Segment]) -> str:
         """
@@ -82,18 +133,27 @@ class OutputFormatter:
         Returns:
             SRT formatted string
         """
-        lines = []
+        return "".join(self.iter_srt(segments))
 
-        for i, segment in enumerate(segments, start=1):
-            start_time = self.format_time_srt(segment.start)
-            end_time = self.format_time_srt(segment.end)
+    def iter_srt(self, segments: Iterable[Segment]) -> Iterator[str]:
+        """
+        Format segments as SRT subtitles, yielding one cue at a time.
 
-            lines.append(str(i))
-            lines.append(f"{start_time} --> {end_time}")
-            lines.append(segment.text)
-            lines.append("")
+        Args:
+            segments: Transcription segments
 
-        return "\n".join(lines)
+        Yields:
+            SRT chunks; joined they form the subtitle file
+        """
+        segments = list(segments)
+        # Start and end times interleaved, formatted in one batch
+        times = self.format_times_srt([t for s in segments for t in (s.start, s.end)])
+
+        for i, segment in enumerate(segments, start=1):
+            start_time = times[2 * i - 2]
+            end_time = times[2 * i - 1]
+            separator = "\n" if i > 1 else ""
+            yield f"{separator}{i}\n{start_time} --> {end_time}\n{segment.text}\n"
 
     def to_plain_text(self, segments: list[Segment]) -> str:
         """
@@ -2,21 +2,31 @@ from __future__ import annotations
 """Main transcription service orchestrating all components."""
 
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Callable
 from uuid import uuid4
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only, selectinload
 
 from transcriber.config import settings
 from transcriber.database import get_session
 from transcriber.models import Segment, Transcription, TranscriptionStatus
-from transcriber.services.audio import AudioExtractor
+from transcriber.services.audio import SAMPLE_RATE, AudioExtractor
 from transcriber.services.formatter import LLMFormatter, OutputFormatter
 from transcriber.services.whisper import WhisperEngine
 
 
+# Whisper jobs get their own threads so long transcriptions don't starve the
+# default executor used by asyncio.to_thread; sized to the model's workers
+_whisper_pool = ThreadPoolExecutor(
+    max_workers=settings.whisper_num_workers,
+    thread_name_prefix="whisper",
+)
+
+
 class TranscriptionService:
     """Orchestrates the transcription process."""
 
@@ -64,6 +74,8 @@ class TranscriptionService:
         file_path = Path(file_path).resolve()
         if not file_path.exists():
             raise FileNotFoundError(f"File not found: {file_path}")
+        # Fail before starting a model load that may first have to download GBs
+        self.audio_extractor.check_supported(file_path)
 
         output_dir = output_dir or file_path.parent
         output_dir = Path(output_dir).resolve()
@@ -73,62 +85,59 @@ class TranscriptionService:
         if progress_callback:
             progress_callback(5)
 
-        audio_path = self.audio_extractor.extract_audio(file_path)
+        # Decode audio straight into memory (no temp WAV) while the model loads
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            model_loading = pool.submit(self.whisper_engine.load)
+            audio = self.audio_extractor.extract_audio_array(file_path)
+            model_loading.result()
 
-        try:
-            # Transcribe
-            def whisper_progress(p: int):
-                if progress_callback:
-                    # Scale Whisper progress to 10-90%
-                    progress_callback(10 + int(p * 0.8))
+        # Transcribe
+        def whisper_progress(p: int):
+            if progress_callback:
+                # Scale Whisper progress to 10-90%
+                progress_callback(10 + int(p * 0.8))
 
-            segments, detected_lang = self.whisper_engine.transcribe(
-                audio_path,
-                language=self.language if self.language != "auto" else None,
-                progress_callback=whisper_progress,
-            )
+        segments, detected_lang, text = self.whisper_engine.transcribe(
+            audio,
+            language=self.language if self.language != "auto" else None,
+            progress_callback=whisper_progress,
+        )
 
-            # Format output
-            text = self.formatter.to_plain_text(segments)
-
-            # LLM formatting if requested
-            if use_llm and self.llm_formatter.is_available:
-                try:
-                    text = self.llm_formatter.format_text(text, detected_lang)
-                    # Re-parse into segments for markdown (simplified)
-                    segments = [Segment(start=0, end=0, text=text)]
-                except Exception:
-                    pass  # Fallback to raw text
-
-            # Write output files
-            base_name = file_path.stem
-            output_paths = []
-
-            if output_format in ("md", "both"):
-                md_path = output_dir / f"{base_name}.md"
-                md_content = self.formatter.to_markdown(
-                    segments,
-                    include_timestamps=include_timestamps,
-                    title=file_path.name,
+        # LLM formatting if requested
+        if use_llm and self.llm_formatter.is_available:
+            try:
+                text = self.llm_formatter.format_text(text, detected_lang)
+                # Re-parse into segments for markdown (simplified)
+                segments = [Segment(start=0, end=0, text=text.strip())]
+            except Exception:
+                pass  # Fallback to raw text
+
+        # Write output files
+        base_name = file_path.stem
+        output_paths = []
+
+        if output_format in ("md", "both"):
+            md_path = output_dir / f"{base_name}.md"
+            with md_path.open("w", encoding="utf-8") as f:
+                f.writelines(
+                    self.formatter.iter_markdown(
+                        segments,
+                        include_timestamps=include_timestamps,
+                        title=file_path.name,
+                    )
                 )
-                md_path.write_text(md_content, encoding="utf-8")
-                output_paths.append(md_path)
+            output_paths.append(md_path)
 
-            if output_format in ("srt", "both"):
-                srt_path = output_dir / f"{base_name}.srt"
-                srt_content = self.formatter.to_srt(segments)
-                srt_path.write_text(srt_content, encoding="utf-8")
-                output_paths.append(srt_path)
+        if output_format in ("srt", "both"):
+            srt_path = output_dir / f"{base_name}.srt"
+            with srt_path.open("w", encoding="utf-8") as f:
+                f.writelines(self.formatter.iter_srt(segments))
+            output_paths.append(srt_path)
 
-            if progress_callback:
-                progress_callback(100)
-
-            return output_paths[0], text
+        if progress_callback:
+            progress_callback(100)
 
-        finally:
-            # Cleanup temp audio
-            if audio_path.exists():
-                audio_path.unlink()
+        return output_paths[0], text
 
     async def create_transcription(
         self,
@@ -168,9 +177,11 @@ class TranscriptionService:
         session: AsyncSession,
         transcription_id: str,
     ) -> Transcription | None:
-        """Get transcription by ID."""
+        """Get transcription by ID, with its segments."""
         result = await session.execute(
-            select(Transcription).where(Transcription.id == transcription_id)
+            select(Transcription)
+            .options(selectinload(Transcription.segments_rel))
+            .where(Transcription.id == transcription_id)
         )
         return result.scalar_one_or_none()
 
@@ -179,9 +190,25 @@ class TranscriptionService:
         session: AsyncSession,
         limit: int = 50,
     ) -> list[Transcription]:
-        """List recent transcriptions."""
+        """
+        List recent transcriptions.
+
+        Only metadata columns are loaded; ``text`` and segments raise if
+        accessed on the returned objects.
+        """
         result = await session.execute(
             select(Transcription)
+            .options(
+                load_only(
+                    Transcription.id,
+                    Transcription.created_at,
+                    Transcription.source_type,
+                    Transcription.source_name,
+                    Transcription.status,
+                    Transcription.duration_seconds,
+                    raiseload=True,
+                )
+            )
             .order_by(Transcription.created_at.desc())
             .limit(limit)
         )
@@ -192,8 +219,12 @@ class TranscriptionService:
         session: AsyncSession,
         transcription_id: str,
     ) -> bool:
-        """Delete transcription by ID."""
-        transcription = await self.get_transcription(session, transcription_id)
+        """
+        Delete transcription by ID.
+
+        Segments are left unloaded; the foreign key's ON DELETE CASCADE removes them.
+        """
+        transcription = await session.get(Transcription, transcription_id)
         if transcription:
             await session.delete(transcription)
             return True
@@ -207,7 +238,7 @@ class TranscriptionService:
         status: str | None = None,
     ):
         """Update transcription progress."""
-        transcription = await self.get_transcription(session, transcription_id)
+        transcription = await session.get(Transcription, transcription_id)
         if transcription:
             transcription.progress = progress
             if status:
@@ -228,61 +259,80 @@ class TranscriptionService:
             file_path: Path to audio/video file
             progress_callback: Callback with (progress, status)
         """
+        # Sessions are kept short: no connection is held while Whisper runs
         async with get_session() as session:
-            transcription = await self.get_transcription(session, transcription_id)
+            transcription = await session.get(Transcription, transcription_id)
             if not transcription:
                 return
 
-            try:
-                transcription.status = TranscriptionStatus.PROCESSING.value
-                await session.flush()
+            # Only milestones are committed; fine-grained progress goes to
+            # progress_callback and is kept in memory by the caller
+            transcription.status = TranscriptionStatus.PROCESSING.value
+            language = transcription.language
 
+        progress = 5
+
+        try:
+            if progress_callback:
+                progress_callback(progress, "processing")
+
+            # Decode audio (no temp WAV) while the model loads
+            audio, _ = await asyncio.gather(
+                asyncio.to_thread(self.audio_extractor.extract_audio_array, file_path),
+                asyncio.to_thread(self.whisper_engine.load),
+            )
+            progress = 10
+            # Duration follows from the decoded samples, no ffprobe call needed
+            await self._save(
+                transcription_id,
+                duration_seconds=int(len(audio) / SAMPLE_RATE),
+                progress=progress,
+            )
+
+            # Transcribe
+            def whisper_progress(p: int):
+                nonlocal progress
+                progress = 10 + int(p * 0.85)
                 if progress_callback:
-                    progress_callback(5, "processing")
-
-                # Extract audio
-                audio_path = self.audio_extractor.extract_audio(file_path)
-
-                # Get duration
-                duration = self.audio_extractor.get_duration(file_path)
-                transcription.duration_seconds = int(duration)
-
-                try:
-                    # Transcribe
-                    def whisper_progress(p: int):
-                        transcription.progress = 10 + int(p * 0.85)
-                        if progress_callback:
-                            progress_callback(transcription.progress, "processing")
-
-                    # Run sync transcription in thread pool
-                    loop = asyncio.get_event_loop()
-                    segments, detected_lang = await loop.run_in_executor(
-                        None,
-                        lambda: self.whisper_engine.transcribe(
-                            audio_path,
-                            language=transcription.language if transcription.language != "auto" else None,
-                            progress_callback=whisper_progress,
-                        ),
-                    )
+                    progress_callback(progress, "processing")
+
+            # Run sync transcription in the dedicated Whisper pool
+            loop = asyncio.get_running_loop()
+            segments, detected_lang, text = await loop.run_in_executor(
+                _whisper_pool,
+                lambda: self.whisper_engine.transcribe_dicts(
+                    audio,
+                    language=language if language != "auto" else None,
+                    progress_callback=whisper_progress,
+                ),
+            )
 
-                    # Update transcription record
-                    transcription.text = self.formatter.to_plain_text(segments)
-                    transcription.segments = [s.to_dict() for s in segments]
-                    transcription.language = detected_lang
-                    transcription.status = TranscriptionStatus.COMPLETED.value
-                    transcription.progress = 100
+            await self._save(
+                transcription_id,
+                text=text,
+                segments=segments,
+                language=detected_lang,
+                status=TranscriptionStatus.COMPLETED.value,
+                progress=100,
+            )
 
-                    if progress_callback:
-                        progress_callback(100, "completed")
+            if progress_callback:
+                progress_callback(100, "completed")
 
-                finally:
-                    # Cleanup
-                    if audio_path.exists():
-                        audio_path.unlink()
+        except Exception as e:
+            await self._save(
+                transcription_id,
+                status=TranscriptionStatus.FAILED.value,
+                error_message=str(e),
+            )
+            if progress_callback:
+                progress_callback(progress, "failed")
+            raise
 
-            except Exception as e:
-                transcription.status = TranscriptionStatus.FAILED.value
-                transcription.error_message = str(e)
-                if progress_callback:
-                    progress_callback(transcription.progress, "failed")
-                raise
+    async def _save(self, transcription_id: str, **fields):
+        """Update transcription columns in a short-lived session."""
+        async with get_session() as session:
+            transcription = await self.get_transcription(session, transcription_id)
+            if transcription:
+                for name, value in fields.items():
+                    setattr(transcription, name, value)
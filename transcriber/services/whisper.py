@@ -1,17 +1,101 @@
 from __future__ import annotations
 """Whisper transcription engine using faster-whisper."""
 
+import platform
+import threading
+from collections import OrderedDict
+from functools import lru_cache
 from pathlib import Path
 from typing import Callable, Iterator, Literal
 
+import numpy as np
 from faster_whisper import WhisperModel
 
 from transcriber.config import settings
 from transcriber.models import Segment
+from transcriber.services.audio import SAMPLE_RATE
+
+# Loaded models shared by all engines, keyed by (model_size, device, compute_type),
+# least recently used first
+_model_cache: OrderedDict[tuple[str, str, str], WhisperModel] = OrderedDict()
+# Guards _model_cache and _model_load_locks; never held while a model loads
+_model_cache_lock = threading.Lock()
+# One lock per key, so loading one model doesn't block loading another
+_model_load_locks: dict[tuple[str, str, str], threading.Lock] = {}
+# MLX repos already run once (mlx-whisper keeps its own model cache)
+_mlx_warmed_up: set[str] = set()
+
+
+def _silence() -> np.ndarray:
+    """One second of silence, enough to make a model allocate its workspace."""
+    return np.zeros(SAMPLE_RATE, dtype=np.float32)
+
+
+def _warm_up(model: WhisperModel) -> None:
+    """Run a freshly loaded model once so the first real job doesn't pay for it."""
+    try:
+        segments_iter, _ = model.transcribe(_silence(), language="en", beam_size=1)
+        for _ in segments_iter:
+            pass
+    except Exception:
+        pass  # A real transcription will surface the error
+
+
+def load_model(model_size: str, device: str, compute_type: str) -> WhisperModel:
+    """
+    Load a Whisper model, reusing an already loaded instance when possible.
+
+    Concurrent jobs share one model; ``settings.whisper_num_workers`` controls
+    how many of them CTranslate2 runs in parallel. At most
+    ``settings.whisper_max_loaded_models`` models stay cached; the least recently
+    used one is dropped first (engines still holding it keep it alive). With
+    ``settings.whisper_preload`` each model is warmed up once, right after loading.
+    """
+    key = (model_size, device, compute_type)
+    with _model_cache_lock:
+        model = _model_cache.get(key)
+        if model is not None:
+            _model_cache.move_to_end(key)
+            return model
+        load_lock = _model_load_locks.setdefault(key, threading.Lock())
+
+    with load_lock:
+        # Another thread may have loaded it while we waited
+        with _model_cache_lock:
+            model = _model_cache.get(key)
+        if model is not None:
+            return model
+
+        model = WhisperModel(
+            model_size,
+            device=device,
+            compute_type=compute_type,
+            num_workers=settings.whisper_num_workers,
+        )
+        if settings.whisper_preload:
+            _warm_up(model)
+
+        with _model_cache_lock:
+            _model_cache[key] = model
+            while len(_model_cache) > max(settings.whisper_max_loaded_models, 1):
+                _model_cache.popitem(last=False)
+    return model
+
+
+@lru_cache(maxsize=1)
+def mlx_whisper_available() -> bool:
+    """Check if mlx-whisper is installed and usable (Apple Silicon only)."""
+    if platform.system() != "Darwin" or platform.machine() != "arm64":
+        return False
+    try:
+        import mlx_whisper  # noqa: F401
+        return True
+    except ImportError:
+        return False
 
 
 class WhisperEngine:
-    """Transcription engine using faster-whisper."""
+    """Transcription engine using faster-whisper (or mlx-whisper on Apple Silicon)."""
 
     def __init__(
         self,
@@ -31,13 +115,21 @@ class WhisperEngine:
         self.device = device or settings.whisper_device
         self.compute_type = compute_type or settings.whisper_compute_type
 
+        # CTranslate2 can't use the Apple GPU; MLX runs the same models on it
+        self.backend = "faster-whisper"
+
         # Resolve "auto" settings
         if self.device == "auto":
-            self.device = self._detect_device()
+            if mlx_whisper_available():
+                self.backend = "mlx"
+                self.device = "mps"
+            else:
+                self.device = self._detect_device()
         if self.compute_type == "auto":
             self.compute_type = self._get_compute_type()
 
         self._model: WhisperModel | None = None
+        self._model_lock = threading.Lock()
 
     def _detect_device(self) -> str:
         """Detect best available device."""
@@ -53,7 +145,7 @@ class WhisperEngine:
 
     def _get_compute_type(self) -> str:
         """Get appropriate compute type for device."""
-        if self.device == "cuda":
+        if self.device == "cuda" or self.backend == "mlx":
             return "float16"
         return "int8"
 
@@ -61,66 +153,152 @@ class WhisperEngine:
     def model(self) -> WhisperModel:
         """Lazy-load Whisper model."""
         if self._model is None:
-            self._model = WhisperModel(
-                self.model_size,
-                device=self.device,
-                compute_type=self.compute_type,
-            )
+            with self._model_lock:
+                if self._model is None:
+                    self._model = load_model(self.model_size, self.device, self.compute_type)
         return self._model
 
+    @property
+    def mlx_repo(self) -> str:
+        """Hugging Face repo with the MLX conversion of the model."""
+        return f"mlx-community/whisper-{self.model_size}-mlx"
+
+    def load(self):
+        """Load the model ahead of transcription (MLX loads on first use)."""
+        if self.backend != "mlx":
+            _ = self.model
+        elif settings.whisper_preload:
+            self._warm_up_mlx()
+
+    def _warm_up_mlx(self):
+        """Run the MLX model once so its weights are loaded before the first job."""
+        with _model_cache_lock:
+            if self.mlx_repo in _mlx_warmed_up:
+                return
+            _mlx_warmed_up.add(self.mlx_repo)
+        try:
+            import mlx_whisper
+            mlx_whisper.transcribe(_silence(), path_or_hf_repo=self.mlx_repo, language="en")
+        except Exception:
+            pass  # A real transcription will surface the error
+
     def transcribe(
         self,
-        audio_path: Path,
+        audio: Path | np.ndarray,
         language: str | None = None,
         progress_callback: Callable[[int], None] | None = None,
-    ) -> tuple[list[Segment], str]:
+    ) -> tuple[list[Segment], str, str]:
         """
-        Transcribe audio file.
+        Transcribe audio.
 
         Args:
-            audio_path: Path to audio file (WAV)
+            audio: Path to audio file, or 16 kHz mono float32 samples
             language: Language code ("ru", "en") or None for auto-detect
             progress_callback: Optional callback for progress updates (0-100)
 
         Returns:
-            Tuple of (segments, detected_language)
+            Tuple of (segments, detected_language, plain_text)
+        """
+        segments_iter, detected_language = self._iter_segments(
+            audio, language, progress_callback
+        )
+        segments: list[Segment] = []
+        text_parts: list[str] = []
+        for start, end, text in segments_iter:
+            segments.append(Segment(start=start, end=end, text=text))
+            text_parts.append(text)
+        return segments, detected_language, " ".join(text_parts)
+
+    def transcribe_dicts(
+        self,
+        audio: Path | np.ndarray,
+        language: str | None = None,
+        progress_callback: Callable[[int], None] | None = None,
+    ) -> tuple[list[dict], str, str]:
+        """
+        Transcribe audio into plain segment dicts, ready for storage.
+
+        Same as :meth:`transcribe` but skips the ``Segment`` objects, for
+        callers that only store the result.
+
+        Returns:
+            Tuple of (segment dicts with start/end/text, detected_language, plain_text)
         """
-        if not audio_path.exists():
-            raise FileNotFoundError(f"Audio file not found: {audio_path}")
+        segments_iter, detected_language = self._iter_segments(
+            audio, language, progress_callback
+        )
+        segments: list[dict] = []
+        text_parts: list[str] = []
+        for start, end, text in segments_iter:
+            segments.append({"start": start, "end": end, "text": text})
+            text_parts.append(text)
+        return segments, detected_language, " ".join(text_parts)
+
+    def _iter_segments(
+        self,
+        audio: Path | np.ndarray,
+        language: str | None,
+        progress_callback: Callable[[int], None] | None,
+    ) -> tuple[Iterator[tuple[float, float, str]], str]:
+        """Start transcription and return a (start, end, text) iterator with the language."""
+        if isinstance(audio, Path):
+            if not audio.exists():
+                raise FileNotFoundError(f"Audio file not found: {audio}")
+            audio = str(audio)
+
+        if self.backend == "mlx":
+            return self._iter_segments_mlx(audio, language, progress_callback)
 
         # Transcribe with Whisper
         segments_iter, info = self.model.transcribe(
-            str(audio_path),
+            audio,
             language=language,
             beam_size=5,
             word_timestamps=False,
             vad_filter=True,
         )
 
-        detected_language = info.language
-        duration = info.duration
+        def generate() -> Iterator[tuple[float, float, str]]:
+            duration = info.duration
+            last_progress = 0
+
+            for segment in segments_iter:
+                yield segment.start, segment.end, segment.text.strip()
+
+                # Report progress based on position in audio
+                if progress_callback and duration > 0:
+                    progress = int((segment.end / duration) * 100)
+                    if progress > last_progress:
+                        progress_callback(min(progress, 100))
+                        last_progress = progress
+
+            # Ensure 100% at the end
+            if progress_callback:
+                progress_callback(100)
+
+        return generate(), info.language
+
+    def _iter_segments_mlx(
+        self,
+        audio: str | np.ndarray,
+        language: str | None,
+        progress_callback: Callable[[int], None] | None,
+    ) -> tuple[Iterator[tuple[float, float, str]], str]:
+        """Transcribe with mlx-whisper (runs to completion, then reports 100%)."""
+        import mlx_whisper
+
+        result = mlx_whisper.transcribe(
+            audio,
+            path_or_hf_repo=self.mlx_repo,
+            language=language,
+            word_timestamps=False,
+        )
 
-        segments: list[Segment] = []
-        last_progress = 0
-
-        for segment in segments_iter:
-            segments.append(
-                Segment(
-                    start=segment.start,
-                    end=segment.end,
-                    text=segment.text.strip(),
-                )
-            )
-
-            # Report progress based on position in audio
-            if progress_callback and duration > 0:
-                progress = int((segment.end / duration) * 100)
-                if progress > last_progress:
-                    progress_callback(min(progress, 100))
-                    last_progress = progress
-
-        # Ensure 100% at the end
         if progress_callback:
             progress_callback(100)
 
-        return segments, detected_language
+        segments_iter = (
+            (segment["start"], segment["end"], segment["text"].strip())
+            for segment in result["segments"]
+        )
+        return segments_iter, result.get("language") or language or ""
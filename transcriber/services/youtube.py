@@ -1,22 +1,121 @@
 from __future__ import annotations
 """YouTube video downloader using yt-dlp."""
 
+import asyncio
+import os
 import re
+import subprocess
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
 from pathlib import Path
+from typing import Callable, Iterator
 
 import yt_dlp
+from yt_dlp.networking import Request
+from yt_dlp.networking.exceptions import HTTPError
 
 from transcriber.config import settings
-from transcriber.services.audio import AudioExtractor
+from transcriber.services.audio import SAMPLE_RATE, AudioExtractor, get_ffmpeg_path
+from transcriber.services.youtube_patterns import extract_video_id, is_youtube_url
+
+# Deletes characters not allowed in file names on common file systems
+_INVALID_FILENAME_CHARS = str.maketrans("", "", '<>:"/\\|?*')
+
+# Playlist parameter in a YouTube URL
+_PLAYLIST_RE = re.compile(r"[?&](?:list|playlist)=")
+
+# Range request size for non-fragmented formats
+HTTP_CHUNK_SIZE = 10 * 1024 * 1024
+# Read size when piping a streamed download into FFmpeg
+STREAM_READ_SIZE = 1 << 20
+
+# Raw yt-dlp info by video ID: (monotonic time fetched, info)
+_info_cache: dict[str, tuple[float, dict]] = {}
+
+
+def _get_cached_info(video_id: str, consume: bool = False) -> dict | None:
+    """Return cached yt-dlp info if it is younger than the configured TTL."""
+    entry = _info_cache.pop(video_id, None) if consume else _info_cache.get(video_id)
+    if entry and time.monotonic() - entry[0] < settings.youtube_info_ttl:
+        return entry[1]
+    return None
+
+
+def _cache_info(video_id: str, info: dict):
+    """Store yt-dlp info, dropping expired entries."""
+    now = time.monotonic()
+    for key, (fetched, _) in list(_info_cache.items()):
+        if now - fetched >= settings.youtube_info_ttl:
+            _info_cache.pop(key, None)
+    _info_cache[video_id] = (now, info)
+
+
+class _ConcurrencyController:
+    """
+    Pick how many downloads to keep in flight from measured throughput.
+
+    Starts low and adds a download while aggregate throughput keeps rising;
+    backs off by one after three samples 10% or more below the best seen.
+    """
+
+    def __init__(self, cap: int, start: int = 2):
+        self.cap = max(1, cap)
+        self.limit = min(start, self.cap)
+        self._best_rate = 0.0
+        self._low_samples = 0
+
+    def update(self, rate: float) -> int:
+        """Record a throughput sample (bytes/s) and return the new limit."""
+        if rate > self._best_rate:
+            self._best_rate = rate
+            self._low_samples = 0
+            if self.limit < self.cap:
+                self.limit += 1
+        elif rate < self._best_rate * 0.9:
+            self._low_samples += 1
+            if self._low_samples >= 3:
+                self._low_samples = 0
+                # Bandwidth dropped; compare against the new level from now on
+                self._best_rate = rate
+                if self.limit > 1:
+                    self.limit -= 1
+        else:
+            self._low_samples = 0
+        return self.limit
+
+
+class _ProgressHook:
+    """yt-dlp progress hook for one download: reports percent and counts bytes."""
+
+    __slots__ = ("downloader", "callback", "last_bytes")
+
+    def __init__(self, downloader: YouTubeDownloader, callback: Callable[[int], None] | None):
+        self.downloader = downloader
+        self.callback = callback
+        self.last_bytes = 0
+
+    def __call__(self, d: dict):
+        if d["status"] != "downloading":
+            return
+        downloaded = d.get("downloaded_bytes") or 0
+        if downloaded > self.last_bytes:
+            self.downloader._add_downloaded_bytes(downloaded - self.last_bytes)
+            self.last_bytes = downloaded
+        if self.callback:
+            total = d.get("total_bytes") or d.get("total_bytes_estimate")
+            if total:
+                self.callback(int(downloaded / total * 100))
 
 
 class YouTubeDownloader:
     """Download videos from YouTube using yt-dlp."""
 
-    YOUTUBE_PATTERNS = [
-        r"(https?://)?(www\.)?youtube\.com/watch\?v=([\w-]+)",
-        r"(https?://)?(www\.)?youtu\.be/([\w-]+)",
-    ]
+    # Info fields returned by default; "description" can be large, so it is opt-in
+    _INFO_FIELDS = ("id", "title", "duration", "uploader")
 
     def __init__(self, output_dir: Path | None = None):
         """
@@ -27,44 +126,110 @@ class YouTubeDownloader:
         """
         self.output_dir = output_dir or settings.temp_dir
 
-    def is_youtube_url(self, url: str) -> bool:
+        # Idle YoutubeDL instances by options kind; each is used by one thread at a time
+        self._ydl_pool: dict[str, list[yt_dlp.YoutubeDL]] = {}
+        self._ydl_pool_lock = threading.Lock()
+
+        # Bytes received by all downloads, sampled by download_many
+        self._bytes_downloaded = 0
+        self._bytes_lock = threading.Lock()
+
+    def close(self):
+        """Close pooled YoutubeDL instances."""
+        with self._ydl_pool_lock:
+            pool, self._ydl_pool = self._ydl_pool, {}
+        for instances in pool.values():
+            for ydl in instances:
+                ydl.close()
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+    def _add_downloaded_bytes(self, count: int):
+        """Count bytes received, for download_many's throughput sampling."""
+        with self._bytes_lock:
+            self._bytes_downloaded += count
+
+    @contextmanager
+    def _borrow_ydl(self, kind: str, opts: dict) -> Iterator[yt_dlp.YoutubeDL]:
+        """
+        Borrow an initialized YoutubeDL from the pool, creating one if none is idle.
+
+        Args:
+            kind: Pool key; all callers using a kind must pass the same options
+            opts: YoutubeDL options for a new instance
+        """
+        with self._ydl_pool_lock:
+            idle = self._ydl_pool.setdefault(kind, [])
+            ydl = idle.pop() if idle else None
+        if ydl is None:
+            ydl = yt_dlp.YoutubeDL(opts)
+        try:
+            yield ydl
+        finally:
+            with self._ydl_pool_lock:
+                self._ydl_pool.setdefault(kind, []).append(ydl)
+
+    @staticmethod
+    def is_youtube_url(url: str) -> bool:
         """Check if URL is a valid YouTube URL."""
-        return any(re.match(pattern, url) for pattern in self.YOUTUBE_PATTERNS)
+        return is_youtube_url(url)
 
-    def extract_video_id(self, url: str) -> str | None:
+    @staticmethod
+    def extract_video_id(url: str) -> str | None:
         """Extract video ID from YouTube URL."""
-        for pattern in self.YOUTUBE_PATTERNS:
-            match = re.match(pattern, url)
-            if match:
-                return match.group(3) if match.lastindex >= 3 else match.group(2)
-        return None
+        return extract_video_id(url)
 
-    def get_video_info(self, url: str) -> dict:
+    def get_video_info(self, url: str, fields: tuple[str, ...] | None = None) -> dict:
         """
         Get video information without downloading.
 
         Args:
             url: YouTube URL
+            fields: yt-dlp info fields to return (default: id, title, duration, uploader)
 
         Returns:
-            Video info dict with title, duration, etc.
+            Video info dict with title, duration, etc. For playlist URLs, the
+            playlist's info with shallow ``entries`` (id, title, duration, url)
         """
-        ydl_opts = {
-            "quiet": True,
-            "no_warnings": True,
-            "extract_flat": False,
-        }
+        is_playlist = _PLAYLIST_RE.search(url) is not None
+        # Playlist info must not be mistaken for the video's info by download()
+        cache_key = url if is_playlist else self.extract_video_id(url) or url
+        info = _get_cached_info(cache_key)
 
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            info = ydl.extract_info(url, download=False)
-            return {
-                "id": info.get("id"),
-                "title": info.get("title"),
-                "duration": info.get("duration"),
-                "uploader": info.get("uploader"),
-                "description": info.get("description"),
+        if info is None:
+            ydl_opts = {
+                "quiet": True,
+                "no_warnings": True,
+                # Only list playlist entries; each video is resolved when downloaded
+                "extract_flat": "in_playlist" if is_playlist else False,
             }
 
+            kind = "playlist_info" if is_playlist else "info"
+            with self._borrow_ydl(kind, ydl_opts) as ydl:
+                info = ydl.extract_info(url, download=False)
+            if not is_playlist:
+                # Drop this extraction's format selection (requested_formats etc.)
+                # so download() selects its own audio format from the cached info
+                info = yt_dlp.YoutubeDL.sanitize_info(info, remove_private_keys=True)
+            _cache_info(cache_key, info)
+
+        summary = {key: info.get(key) for key in fields or self._INFO_FIELDS}
+        if info.get("_type") == "playlist":
+            summary["entries"] = [
+                {
+                    "id": entry.get("id"),
+                    "title": entry.get("title"),
+                    "duration": entry.get("duration"),
+                    "url": entry.get("url"),
+                }
+                for entry in info.get("entries") or []
+            ]
+        return summary
+
     def download(
         self,
         url: str,
@@ -80,56 +245,288 @@ class YouTubeDownloader:
         Returns:
             Tuple of (path to downloaded file, video title)
         """
-        if not self.is_youtube_url(url):
-            raise ValueError(f"Invalid YouTube URL: {url}")
+        output_path, info = self.download_with_info(url, progress_callback)
+        return output_path, self._sanitize_filename(info["title"])
 
+    def download_with_info(
+        self,
+        url: str,
+        progress_callback: callable | None = None,
+    ) -> tuple[Path, dict]:
+        """
+        Download YouTube video and return its metadata from the same yt-dlp call.
+
+        Use this instead of calling get_video_info before download.
+
+        Args:
+            url: YouTube URL
+            progress_callback: Optional callback for progress updates
+
+        Returns:
+            Tuple of (path to downloaded file, video info dict as from get_video_info)
+        """
+        # One regex match both validates the URL and yields the ID
         video_id = self.extract_video_id(url)
-        output_template = str(self.output_dir / f"{video_id}.%(ext)s")
+        if video_id is None:
+            raise ValueError(f"Invalid YouTube URL: {url}")
+
+        # Named by yt-dlp's id so pooled instances share options
+        output_template = str(self.output_dir / "%(id)s.%(ext)s")
 
-        def progress_hook(d):
-            if d["status"] == "downloading" and progress_callback:
-                if "total_bytes" in d and d["total_bytes"]:
-                    percent = int(d["downloaded_bytes"] / d["total_bytes"] * 100)
-                    progress_callback(percent)
-                elif "total_bytes_estimate" in d and d["total_bytes_estimate"]:
-                    percent = int(d["downloaded_bytes"] / d["total_bytes_estimate"] * 100)
-                    progress_callback(percent)
+        progress_hook = _ProgressHook(self, progress_callback)
 
         ydl_opts = {
             "format": "bestaudio[ext=m4a]/bestaudio/best",
             "outtmpl": output_template,
+            # A watch URL with a list= parameter still means this one video
+            "noplaylist": True,
             "quiet": True,
             "no_warnings": True,
-            "progress_hooks": [progress_hook],
+            # Fetch DASH/HLS fragments in parallel and retry them individually
+            "concurrent_fragment_downloads": settings.youtube_fragment_downloads,
+            "http_chunk_size": HTTP_CHUNK_SIZE,
+            "retries": 3,
+            "fragment_retries": 3,
+            # Let yt-dlp's own FFmpeg pass write the WAV (bundled ffmpeg is enough),
+            # already in the 16 kHz mono format Whisper uses
+            "ffmpeg_location": get_ffmpeg_path(),
+            "postprocessors": [
+                {"key": "FFmpegExtractAudio", "preferredcodec": "wav", "preferredquality": "0"}
+            ],
+            "postprocessor_args": {"extractaudio": ["-ar", str(SAMPLE_RATE), "-ac", "1"]},
         }
 
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            info = ydl.extract_info(url, download=True)
-            title = info.get("title", video_id)
+        # Reuse metadata fetched by get_video_info; yt-dlp updates it in place,
+        # so it is taken out of the cache
+        cached_info = _get_cached_info(video_id, consume=True)
 
-        # Find the downloaded file
+        stream = settings.youtube_stream_audio
         downloaded_path = None
-        for ext in ["m4a", "webm", "mp3", "mp4", "ogg", "wav"]:
-            candidate = self.output_dir / f"{video_id}.{ext}"
-            if candidate.exists():
-                downloaded_path = candidate
-                break
 
-        if not downloaded_path:
-            raise FileNotFoundError(f"Downloaded file not found for video: {video_id}")
+        with self._borrow_ydl("download", ydl_opts) as ydl:
+            # Pooled instances outlive this call, so the hook is removed afterwards
+            ydl.add_progress_hook(progress_hook)
+            try:
+                # When streaming, only resolve the format here and fetch it below
+                if cached_info is not None:
+                    info = ydl.process_ie_result(cached_info, download=not stream)
+                else:
+                    info = ydl.extract_info(url, download=not stream)
+
+                # yt-dlp's id names the file; it can differ from what the URL regex matched
+                output_path = self.output_dir / f"{info.get('id') or video_id}.wav"
+
+                if stream:
+                    if info.get("protocol") in ("http", "https"):
+                        self._stream_to_wav(ydl, info, output_path, progress_hook)
+                        downloaded_path = output_path
+                    else:
+                        # Fragmented formats go through yt-dlp's downloader
+                        info = ydl.process_ie_result(info, download=True)
+            finally:
+                ydl._progress_hooks.remove(progress_hook)
+
+        if downloaded_path is None:
+            # yt-dlp reports where it saved the file (after any postprocessing);
+            # otherwise it is where the WAV postprocessor always writes it
+            requested = info.get("requested_downloads")
+            if requested and requested[0].get("filepath"):
+                downloaded_path = Path(requested[0]["filepath"])
+            else:
+                downloaded_path = output_path
 
-        # Convert to WAV using bundled ffmpeg (no system ffprobe needed)
-        output_path = self.output_dir / f"{video_id}.wav"
+        # Fallback if the postprocessor did not produce a WAV
         if downloaded_path.suffix != ".wav":
+            # Convert next to the target and move it into place, so a crash never
+            # leaves a truncated WAV under the final name
+            tmp_path = output_path.with_suffix(".tmp.wav")
             extractor = AudioExtractor()
-            output_path = extractor.extract_audio(downloaded_path, output_path)
-            downloaded_path.unlink()  # remove original
+            try:
+                extractor.extract_audio(downloaded_path, tmp_path)
+            except BaseException:
+                tmp_path.unlink(missing_ok=True)
+                raise
+            os.replace(tmp_path, output_path)
+            downloaded_path.unlink(missing_ok=True)  # remove original
+
+        summary = {key: info.get(key) for key in self._INFO_FIELDS}
+        summary["title"] = summary["title"] or video_id
+        return output_path, summary
+
+    def _stream_to_wav(
+        self,
+        ydl: yt_dlp.YoutubeDL,
+        info: dict,
+        output_path: Path,
+        progress_hook: Callable[[dict], None],
+    ):
+        """
+        Fetch the selected format in ranged chunks and pipe it through FFmpeg into a WAV.
+
+        The compressed audio never touches the disk; only the final WAV is written,
+        under a temporary name until FFmpeg succeeds.
+        """
+        tmp_path = output_path.with_suffix(".tmp.wav")
+        cmd = [
+            get_ffmpeg_path(),
+            "-hide_banner",
+            "-loglevel", "error",
+            "-i", "pipe:0",
+            "-vn",
+            "-acodec", "pcm_s16le",
+            "-ar", str(SAMPLE_RATE),
+            "-ac", "1",
+            "-y",
+            str(tmp_path),
+        ]
+        total = info.get("filesize") or info.get("filesize_approx")
+        headers = info.get("http_headers") or {}
+        downloaded = 0
+
+        # FFmpeg's stderr goes to a file: an unread pipe could fill up and stall
+        # FFmpeg while we block writing to its stdin
+        with tempfile.TemporaryFile() as stderr_file:
+            process = subprocess.Popen(cmd, stdin=subprocess.PIPE, stderr=stderr_file)
+            try:
+                while not total or downloaded < total:
+                    # Ranged requests, like yt-dlp's http_chunk_size, avoid YouTube throttling
+                    end = downloaded + HTTP_CHUNK_SIZE - 1
+                    request = Request(
+                        info["url"], headers={**headers, "Range": f"bytes={downloaded}-{end}"}
+                    )
+                    try:
+                        response = ydl.urlopen(request)
+                    except HTTPError as e:
+                        if e.status == 416:  # Range starts past the end of the file
+                            break
+                        raise
+
+                    with response:
+                        received = 0
+                        while True:
+                            chunk = response.read(STREAM_READ_SIZE)
+                            if not chunk:
+                                break
+                            process.stdin.write(chunk)
+                            received += len(chunk)
+                            downloaded += len(chunk)
+                            progress_hook({
+                                "status": "downloading",
+                                "downloaded_bytes": downloaded,
+                                "total_bytes": total,
+                            })
+
+                    # A server that ignores Range sends the whole file at once
+                    if response.status != 206 or received == 0:
+                        break
+                    # Without a known size, a short chunk is the last one; with one,
+                    # servers may cap ranges below HTTP_CHUNK_SIZE, so keep going
+                    if not total and received < HTTP_CHUNK_SIZE:
+                        break
+
+                if total and downloaded < total:
+                    raise RuntimeError(
+                        f"Download ended early: got {downloaded} of {total} bytes"
+                    )
+            except BrokenPipeError:
+                pass  # FFmpeg exited early; its error is reported below
+            except BaseException:
+                process.kill()
+                process.wait()
+                tmp_path.unlink(missing_ok=True)
+                raise
+            finally:
+                if process.returncode is None:
+                    try:
+                        process.stdin.close()
+                    except BrokenPipeError:
+                        pass
+
+            process.wait()
+            if process.returncode != 0:
+                tmp_path.unlink(missing_ok=True)
+                stderr_file.seek(0)
+                stderr = stderr_file.read()
+                raise RuntimeError(f"FFmpeg failed: {stderr.decode('utf-8', 'replace')}")
+        os.replace(tmp_path, output_path)
+
+    def download_many(
+        self,
+        urls: list[str],
+        max_workers: int | None = None,
+    ) -> list[tuple[Path, str]]:
+        """
+        Download several YouTube videos in parallel.
+
+        The number of downloads in flight adapts to measured throughput,
+        between 1 and ``max_workers``.
+
+        Args:
+            urls: YouTube URLs
+            max_workers: Most parallel downloads (default: settings.youtube_max_workers)
+
+        Returns:
+            List of (path to downloaded file, video title), in the order of ``urls``
+        """
+        controller = _ConcurrencyController(max_workers or settings.youtube_max_workers)
+        results: list[tuple[Path, str] | None] = [None] * len(urls)
+        pending = deque(enumerate(urls))
+        running: dict[Future, int] = {}
+
+        last_time = time.monotonic()
+        last_bytes = self._bytes_downloaded
+
+        with ThreadPoolExecutor(max_workers=controller.cap, thread_name_prefix="yt-dlp") as pool:
+            while pending or running:
+                while pending and len(running) < controller.limit:
+                    index, url = pending.popleft()
+                    running[pool.submit(self.download, url)] = index
+
+                done, _ = wait(running, timeout=1.0, return_when=FIRST_COMPLETED)
+                for future in done:
+                    results[running.pop(future)] = future.result()
+
+                # Sample aggregate throughput about once a second
+                now = time.monotonic()
+                if now - last_time >= 1.0:
+                    total = self._bytes_downloaded
+                    controller.update((total - last_bytes) / (now - last_time))
+                    last_time, last_bytes = now, total
+
+        return results
+
+    async def adownload(
+        self,
+        url: str,
+        progress_callback: callable | None = None,
+    ) -> tuple[Path, str]:
+        """Download YouTube video without blocking the event loop (see download)."""
+        return await asyncio.to_thread(self.download, url, progress_callback)
+
+    async def adownload_many(
+        self,
+        urls: list[str],
+        limit: int | None = None,
+    ) -> list[tuple[Path, str]]:
+        """
+        Download several YouTube videos concurrently from async code.
+
+        Args:
+            urls: YouTube URLs
+            limit: Downloads in flight at once (default: settings.youtube_max_workers)
+
+        Returns:
+            List of (path to downloaded file, video title), in the order of ``urls``
+        """
+        semaphore = asyncio.Semaphore(limit or settings.youtube_max_workers)
+
+        async def download_one(url: str) -> tuple[Path, str]:
+            async with semaphore:
+                return await self.adownload(url)
 
-        return output_path, self._sanitize_filename(title)
+        return list(await asyncio.gather(*(download_one(url) for url in urls)))
 
     def _sanitize_filename(self, name: str) -> str:
         """Sanitize filename for safe file system use."""
-        # Remove invalid characters
-        name = re.sub(r'[<>:"/\\|?*]', "", name)
-        # Limit length
-        return name[:200] if len(name) > 200 else name
+        # Remove invalid characters and limit length
+        return name.translate(_INVALID_FILENAME_CHARS)[:200]
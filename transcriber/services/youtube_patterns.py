@@ -0,0 +1,32 @@
+from __future__ import annotations
+"""Precompiled YouTube URL patterns shared by the CLI and the downloader."""
+
+import re
+from functools import lru_cache
+
+# Matches watch and short URLs; group 1 is the video ID
+YOUTUBE_URL_RE = re.compile(
+    r"(?:https?://)?(?:www\.)?(?:youtube\.com/watch\?v=|youtu\.be/)([\w-]+)"
+)
+
+# Canonical URL prefixes that can be checked without the regex
+_FAST_PREFIXES = ("https://www.youtube.com/watch?v=", "https://youtu.be/")
+
+
+@lru_cache(maxsize=4096)
+def is_youtube_url(url: str) -> bool:
+    """Check if URL is a valid YouTube URL (cached, URLs recur across calls)."""
+    for prefix in _FAST_PREFIXES:
+        if url.startswith(prefix):
+            # Same as the regex: at least one [\w-] character must follow
+            first = url[len(prefix):len(prefix) + 1]
+            return first.isalnum() or first in ("_", "-")
+    # Shares extract_video_id's cache, so a URL checked here is not matched again
+    return extract_video_id(url) is not None
+
+
+@lru_cache(maxsize=4096)
+def extract_video_id(url: str) -> str | None:
+    """Extract video ID from YouTube URL (cached)."""
+    match = YOUTUBE_URL_RE.match(url)
+    return match.group(1) if match else None